@@ -0,0 +1,111 @@
+import time
+import asyncio
+import threading
+import traceback
+
+# --- 사용자 정의 모듈 Import ---
+try:
+    import read  # 요청 인코딩/응답 파싱, 타임아웃 상수
+except ImportError as e:
+    print(f"오류(async_transport.py): 필요한 모듈 import 실패 ({e}).")
+    raise
+
+# --- DataReader 위의 asyncio API ---
+# 포트는 계속 DataReader 스레드 하나가 소유함 (텔레메트리 폴링, 요청 multiplexing,
+# STOP 우선 송신). 여기서는 submit() 이 돌려주는 concurrent Future 를 await 할 수
+# 있게 감싸서, 설정 읽기/쓰기처럼 요청이 이어지는 트랜잭션을 작업마다 스레드를
+# 만들지 않고 이벤트 루프 하나의 coroutine 으로 실행함.
+# 결과는 TkBridge 가 after() 로 Tk 스레드에 넘김.
+REPLY_GRACE = 1.0  # reader 의 응답 timeout 처리 이후 추가로 기다리는 시간 (seconds)
+
+
+class AsyncLink:
+    """Coroutine request/response API over the DataReader that owns a port."""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    async def request(self, packet, reply_id, timeout):
+        """Reply payload for packet, or None on timeout. Raises
+        serial.SerialException if the port is lost or changed meanwhile."""
+        fut = asyncio.wrap_future(self.reader.submit(packet, reply_id, timeout))
+        try:
+            return await asyncio.wait_for(fut, timeout + REPLY_GRACE)
+        except asyncio.TimeoutError:
+            return None
+
+    async def fw_info(self):
+        """Parsed COMM_FW_VERSION reply, or None."""
+        payload = await self.request(
+            read.encode_fw_version_request(),
+            read.COMM_FW_VERSION,
+            read.FW_INFO_TIMEOUT,
+        )
+        return read.parse_fw_version(payload) if payload else None
+
+    async def read_config(self, kind):
+        """(parsed, raw serialized) "mcconf"/"appconf", (None, None) on failure."""
+        packet, reply_id = read.encode_config_request(kind)
+        payload = await self.request(packet, reply_id, read.CONFIG_READ_TIMEOUT)
+        if payload is None:
+            print(f"Error: Timeout waiting for {kind.upper()} response.")
+        return read.parse_config_reply(kind, payload)
+
+    async def write_config(self, packet):
+        """Writes SET_MCCONF/SET_APPCONF and waits for the ack (a frame with
+        the same ID). Returns the write -> ack latency or None."""
+        start = time.monotonic()
+        ack = await self.request(
+            packet, read.packet_id(packet), read.CONFIG_WRITE_TIMEOUT
+        )
+        if ack is None:
+            return None
+        latency = time.monotonic() - start
+        print(
+            f"Info: Config write ack (ID: {read.packet_id(packet)}) in {latency:.3f}s."
+        )
+        return latency
+
+
+class TkBridge:
+    """Runs coroutines on one event-loop thread shared by the app and hands
+    each result to the Tk thread with after()."""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="asyncio", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro, callback):
+        """Schedules coro; callback(result) then runs on the Tk thread.
+        Coroutines report their own errors in the result: an exception that
+        escapes one is printed and the callback is skipped."""
+        fut = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        fut.add_done_callback(lambda f: self._done(f, callback))
+        return fut
+
+    async def _shutdown(self):
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)  # 취소 처리가 끝난 뒤 정지
+        self.loop.stop()
+
+    def _done(self, fut, callback):
+        if fut.cancelled():
+            return  # 앱 종료 중
+        exc = fut.exception()
+        if exc is not None:
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+            return
+        self.widget.after(0, callback, fut.result())
+
+    def close(self):
+        """Cancels unfinished coroutines and stops the loop thread."""
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self._thread.join(timeout=1.0)
+        if not self._thread.is_alive():
+            self.loop.close()
@@ -0,0 +1,294 @@
+import os
+import time
+import struct
+import threading
+from collections import deque
+
+# --- 시리얼 원시 바이트 캡처 / 재생 ---
+# 파일 형식 (big-endian):
+#   header : MAGIC(8) + version(u16) + 시작 wall clock(f64) + 시작 monotonic ns(u64)
+#   record : 방향(u8: 0=RX, 1=TX) + 시작 이후 ns(u64) + 길이(u32) + 데이터
+#   index  : (ns(u64), record 파일 offset(u64)) x N  -- INDEX_INTERVAL record 마다
+#   footer : index offset(u64) + record 수(u64) + 마지막 record ns(u64) + INDEX_MAGIC(8)
+# footer 가 없으면 (캡처 중 비정상 종료) 재생 시 record 를 처음부터 순차로 읽음.
+MAGIC = b"RTCAP\x00\x00\x01"
+INDEX_MAGIC = b"RTCAPIDX"
+VERSION = 1
+HEADER = struct.Struct(">8sHdQ")
+RECORD = struct.Struct(">BQI")
+INDEX_ENTRY = struct.Struct(">QQ")
+FOOTER = struct.Struct(">QQQ8s")
+DIR_RX = 0
+DIR_TX = 1
+INDEX_INTERVAL = 256  # index 항목 하나당 record 수
+
+CAPTURE_DIR = os.path.join(os.path.expanduser("~"), ".rotom_control", "captures")
+REPLAY_BUFFER_LIMIT = 65536  # 최대 속도 재생 시 미리 풀어두는 RX 바이트 상한
+
+
+def default_capture_path():
+    return os.path.join(
+        CAPTURE_DIR, time.strftime("capture_%Y%m%d_%H%M%S.rcap", time.localtime())
+    )
+
+
+class CaptureSerial:
+    """Wraps an open pyserial port and records every byte read and written,
+    with monotonic nanosecond timestamps, into a capture file.
+
+    Everything else is delegated to the wrapped port, so it can be used
+    wherever serial_connection is.
+    """
+
+    def __init__(self, ser, path=None):
+        self._ser = ser
+        self.path = path or default_capture_path()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "wb")
+        # reader 스레드 기록과 GUI 스레드 close() 동시 실행
+        self._lock = threading.Lock()
+        self._t0 = time.monotonic_ns()
+        self._file.write(HEADER.pack(MAGIC, VERSION, time.time(), self._t0))
+        self._index = []
+        self._last_t = 0
+        self.records = 0
+        self.bytes_rx = 0
+        self.bytes_tx = 0
+
+    def _record(self, direction, data):
+        if not data:
+            return
+        with self._lock:
+            if self._file.closed:
+                return
+            t = time.monotonic_ns() - self._t0
+            if self.records % INDEX_INTERVAL == 0:
+                self._index.append((t, self._file.tell()))
+            self._file.write(RECORD.pack(direction, t, len(data)))
+            self._file.write(data)
+            self._last_t = t
+            self.records += 1
+
+    # --- pyserial 인터페이스 ---
+    def read(self, size=1):
+        data = self._ser.read(size)
+        self.bytes_rx += len(data)
+        self._record(DIR_RX, data)
+        return data
+
+    def write(self, data):
+        n = self._ser.write(data)
+        self.bytes_tx += len(data)
+        self._record(DIR_TX, bytes(data))
+        return n
+
+    @property
+    def timeout(self):
+        return self._ser.timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self._ser.timeout = value
+
+    def close(self):
+        try:
+            self._ser.close()
+        finally:
+            self.finish()
+
+    def finish(self):
+        """Writes the index and footer and closes the capture file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            index_offset = self._file.tell()
+            for t, offset in self._index:
+                self._file.write(INDEX_ENTRY.pack(t, offset))
+            self._file.write(
+                FOOTER.pack(index_offset, self.records, self._last_t, INDEX_MAGIC)
+            )
+            self._file.close()
+        print(
+            f"Info(capture): {self.records} records "
+            f"(RX {self.bytes_rx} B, TX {self.bytes_tx} B) -> {self.path}"
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._ser, name)
+
+
+class CaptureReader:
+    """Sequential/indexed access to a capture file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        magic, version, self.start_wall, self.start_ns = HEADER.unpack(
+            self._file.read(HEADER.size)
+        )
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise ValueError(f"Not a capture file: {path}")
+        self.index, self.records, self._end, self._last_t = self._load_index()
+
+    def _load_index(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size >= HEADER.size + FOOTER.size:
+            self._file.seek(size - FOOTER.size)
+            index_offset, records, last_t, magic = FOOTER.unpack(
+                self._file.read(FOOTER.size)
+            )
+            if magic == INDEX_MAGIC:
+                self._file.seek(index_offset)
+                count = (size - FOOTER.size - index_offset) // INDEX_ENTRY.size
+                raw = self._file.read(count * INDEX_ENTRY.size)
+                index = [e for e in INDEX_ENTRY.iter_unpack(raw)]
+                self._file.seek(HEADER.size)
+                return index, records, index_offset, last_t
+        self._file.seek(HEADER.size)
+        return [], None, size, None  # footer 없음: 끝까지 순차 읽기
+
+    def duration(self):
+        """Capture length in seconds: time of the last record."""
+        if self._last_t is None:
+            self._last_t = self._scan_last_time()
+        return self._last_t / 1e9
+
+    def _scan_last_time(self):
+        # footer 없는 파일: 데이터는 건너뛰며 record header 만 끝까지 읽음
+        pos = self._file.tell()
+        self._file.seek(HEADER.size)
+        last = 0
+        while self._file.tell() + RECORD.size <= self._end:
+            _, t, length = RECORD.unpack(self._file.read(RECORD.size))
+            if self._file.tell() + length > self._end:
+                break  # 잘린 마지막 record
+            self._file.seek(length, os.SEEK_CUR)
+            last = t
+        self._file.seek(pos)
+        return last
+
+    def seek(self, t_ns):
+        """Positions at the indexed record at or before t_ns."""
+        offset = HEADER.size
+        for t, off in self.index:
+            if t > t_ns:
+                break
+            offset = off
+        self._file.seek(offset)
+
+    def next_record(self):
+        """Returns (direction, t_ns, data) or None at the end."""
+        if self._file.tell() + RECORD.size > self._end:
+            return None
+        head = self._file.read(RECORD.size)
+        if len(head) < RECORD.size:
+            return None
+        direction, t, length = RECORD.unpack(head)
+        data = self._file.read(length)
+        if len(data) < length:
+            return None  # 비정상 종료로 잘린 마지막 record
+        return direction, t, data
+
+    def close(self):
+        self._file.close()
+
+
+class ReplaySerial:
+    """Serial-like transport that feeds the RX stream of a capture back
+    at its recorded timing.
+
+    speed=1 replays in real time, N replays N times faster, and 0/None
+    delivers bytes as fast as they are read. Writes are accepted and
+    discarded. replay_time is the capture-relative time (seconds) of
+    the last byte returned.
+    """
+
+    def __init__(self, path, speed=1.0, start=0.0):
+        self.reader = CaptureReader(path)
+        self.port = path
+        self.speed = speed or None
+        self.timeout = 0.5
+        self.is_open = True
+        self.finished = False
+        self.replay_time = start
+        self.start_wall = self.reader.start_wall
+        self._buf = bytearray()
+        # (누적 RX 바이트 끝 위치, record 시각): 읽은 위치로 replay_time 추적
+        self._times = deque()
+        self._buffered_total = 0
+        self._read_total = 0
+        self._pending = None  # 아직 시각이 되지 않은 다음 RX record
+        self._start_ns = int(start * 1e9)
+        self.reader.seek(self._start_ns)
+        self._t0 = time.monotonic()
+        self.bytes_written = 0
+
+    def _elapsed_ns(self):
+        if self.speed is None:
+            return None
+        return self._start_ns + int((time.monotonic() - self._t0) * self.speed * 1e9)
+
+    def _pump(self, want=1):
+        """Moves every RX record whose time has come into the buffer. At max
+        speed records are released only until want bytes are buffered, so
+        each read still maps to capture times closely."""
+        now = self._elapsed_ns()
+        while self.is_open and len(self._buf) < REPLAY_BUFFER_LIMIT:
+            if now is None and len(self._buf) >= want:
+                return 0.0
+            rec = self._pending or self.reader.next_record()
+            self._pending = None
+            if rec is None:
+                self.finished = True
+                return None
+            direction, t, data = rec
+            if t < self._start_ns or direction != DIR_RX:
+                continue
+            if now is not None and t > now:
+                self._pending = rec
+                return (t - now) / 1e9 / self.speed  # 다음 record 까지 남은 시간
+            self._buf += data
+            self._buffered_total += len(data)
+            self._times.append((self._buffered_total, t))
+        return 0.0
+
+    @property
+    def in_waiting(self):
+        self._pump()
+        return len(self._buf)
+
+    def read(self, size=1):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            wait = self._pump(size)
+            if len(self._buf) >= size or (self.finished and not self._pending):
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            if wait is None:
+                wait = 0.05  # 재생 종료: 남은 timeout 동안 빈 포트처럼 대기
+            time.sleep(min(w for w in (wait, remaining, 0.05) if w is not None))
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        self._read_total += len(data)
+        while self._times and self._times[0][0] <= self._read_total:
+            self.replay_time = self._times.popleft()[1] / 1e9
+        return data
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        return len(data)
+
+    def reset_input_buffer(self):
+        self._read_total = self._buffered_total
+        self._buf.clear()
+        self._times.clear()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+        self.reader.close()
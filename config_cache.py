@@ -0,0 +1,90 @@
+import os
+import time
+import pickle
+import hashlib
+
+# --- MCCONF/APPCONF 로컬 캐시 ---
+# 장치(UUID) + 펌웨어 버전 + HW 이름 단위로 마지막으로 읽거나 쓴 설정을 저장.
+# 파일마다 raw serialized payload 와 파싱된 dict 를 함께 보관함.
+# 펌웨어에는 설정 해시/시그니처만 묻는 명령이 없어 (GET_MCCONF 는 항상 전체 전송)
+# 캐시가 장치와 같은지 싸게 확인할 방법이 없음: 다른 도구(VESC Tool 등)로 바꾼
+# 설정은 감지되지 않으므로 캐시 사용은 사용자가 명시적으로 켤 때만.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".rotom_control", "config_cache")
+CACHE_VERSION = 1
+
+KINDS = ("mcconf", "appconf")
+
+
+def device_key(fw_info):
+    """Cache key for a device from read.parse_fw_version(), or None if the
+    firmware does not report a UUID (devices could not be told apart)."""
+    if not fw_info or not fw_info.get("uuid"):
+        return None
+    hw = "".join(c if c.isalnum() else "-" for c in fw_info.get("hw_name", ""))
+    return f"{fw_info['uuid']}_fw{fw_info['fw_major']}.{fw_info['fw_minor']:02d}_{hw}"
+
+
+def payload_digest(raw):
+    return hashlib.sha256(bytes(raw)).hexdigest()
+
+
+class ConfigCache:
+    """On-disk cache of MCCONF/APPCONF blobs, as of this app's last read or
+    write of the device (not checked against the device)."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, key, kind):
+        return os.path.join(self.directory, f"{key}_{kind}.pkl")
+
+    def load(self, key, kind):
+        """Returns (parsed, raw, saved_at) or None if missing or unreadable."""
+        if not key:
+            return None
+        try:
+            with open(self._path(key, kind), "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warn(cache): Failed to load {kind} cache: {e}")
+            return None
+        parsed, raw = entry.get("parsed"), entry.get("raw")
+        # 캐시 파일 형식만 확인 (내용이 장치와 같은지는 알 수 없음)
+        if (
+            entry.get("version") != CACHE_VERSION
+            or not isinstance(parsed, dict)
+            or raw is None
+        ):
+            print(f"Warn(cache): Discarding unreadable {kind} cache for {key}.")
+            return None
+        return parsed, raw, entry.get("saved_at")
+
+    def store(self, key, kind, parsed, raw):
+        if not key or not parsed or raw is None:
+            return
+        entry = {
+            "version": CACHE_VERSION,
+            "raw": bytes(raw),
+            "parsed": parsed,
+            "saved_at": time.time(),
+        }
+        path = self._path(key, kind)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)  # 중간에 죽어도 기존 캐시는 유지
+        except Exception as e:
+            print(f"Warn(cache): Failed to store {kind} cache: {e}")
+
+    def invalidate(self, key, kind=None):
+        for k in [kind] if kind else KINDS:
+            try:
+                os.remove(self._path(key, k))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Warn(cache): Failed to remove {k} cache: {e}")
@@ -2,20 +2,39 @@ import tkinter
 import tkinter.messagebox
 import customtkinter
 import glob
+import os
+import tkinter.filedialog
 import threading
 import time
 import queue
 import serial
 import sys
 from collections import deque
+from concurrent.futures import Future, InvalidStateError
 import copy
 import traceback  # 오류 추적용
 
 # --- 사용자 정의 모듈 및 pyvesc 컴포넌트 Import ---
 try:
     import read  # VESC 통신 함수 모음
+    import config_cache  # MCCONF/APPCONF 로컬 캐시
+    import capture  # 시리얼 원시 바이트 캡처/재생
+    import async_transport  # DataReader 위의 coroutine 요청 API, Tk bridge
+    import recorder  # 장시간 텔레메트리 columnar 기록
+    from plot_buffer import (  # 플롯 데이터 버퍼/축소/세션 history
+        RingBuffer,
+        MinMaxPyramid,
+        minmax_decimate,
+        value_range,
+    )
+    import plot_channels  # 플롯 가능한 텔레메트리 채널 registry
+    from plot_render import (  # blitting, 렌더링 시간 기반 갱신 주기
+        BlitManager,
+        RefreshGovernor,
+    )
     from pyvesc.VESC.messages import SetCurrent, SetDutyCycle, SetRPM  # 기본 제어
     from pyvesc.VESC.messages.setters import SetMcConf, SetAppConf
+    from pyvesc.protocol.interface import encode
     from pyvesc.VESC.messages.vesc_protocol_utils import (
         encode_set_mcconf,
         encode_set_appconf,
@@ -39,9 +58,108 @@ customtkinter.set_appearance_mode("Dark")
 customtkinter.set_default_color_theme("blue")
 
 
+# --- Deadline Scheduler ---
+class DeadlineScheduler:
+    """Fixed-rate sampling deadlines on a monotonic clock.
+
+    Each tick records how late it was issued against its ideal deadline.
+    A tick that is late by less than one period is caught up (the phase is
+    kept); later than that, the missed deadlines are skipped and counted as
+    an overrun.
+    """
+
+    def __init__(self, rate_hz, clock=time.monotonic):
+        self.rate_hz = float(rate_hz)
+        self.period = 1.0 / self.rate_hz
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Starts a new statistics session."""
+        self.next_deadline = None
+        self.started_at = None
+        self.ticks = 0
+        self.skipped = 0
+        self.overruns = 0
+        self.jitter_max = 0.0
+        self._jitter_sum = 0.0
+        self._jitter_sq_sum = 0.0
+
+    def resync(self):
+        """Restarts the deadline grid (after a pause) keeping statistics."""
+        self.next_deadline = None
+
+    def time_until_next(self, now=None):
+        if self.next_deadline is None:
+            return 0.0
+        now = self.clock() if now is None else now
+        return max(0.0, self.next_deadline - now)
+
+    def due(self, now=None):
+        return self.time_until_next(now) <= 0.0
+
+    def tick(self, now=None):
+        """Marks the current deadline as sampled and schedules the next one."""
+        now = self.clock() if now is None else now
+        if self.next_deadline is None:
+            self.next_deadline = now
+        if self.started_at is None:
+            self.started_at = now
+        late = max(0.0, now - self.next_deadline)
+        self.ticks += 1
+        self._jitter_sum += late
+        self._jitter_sq_sum += late * late
+        self.jitter_max = max(self.jitter_max, late)
+        self._advance(late)
+
+    def skip(self, now=None):
+        """Drops the current deadline without sampling."""
+        now = self.clock() if now is None else now
+        if self.next_deadline is None:
+            self.next_deadline = now
+        self.skipped += 1
+        self._advance(max(0.0, now - self.next_deadline))
+
+    def _advance(self, late):
+        if late >= self.period:
+            # 한 주기 이상 늦음 -> 놓친 deadline은 건너뛰고 위상 유지
+            missed = int(late / self.period)
+            self.skipped += missed
+            self.overruns += 1
+            self.next_deadline += (missed + 1) * self.period
+        else:
+            self.next_deadline += self.period
+
+    def stats(self):
+        n = self.ticks
+        mean = self._jitter_sum / n if n else 0.0
+        var = max(0.0, self._jitter_sq_sum / n - mean * mean) if n else 0.0
+        elapsed = self.clock() - self.started_at if self.started_at else 0.0
+        return {
+            "target_hz": self.rate_hz,
+            "actual_hz": n / elapsed if elapsed > 0 else 0.0,
+            "ticks": n,
+            "skipped": self.skipped,
+            "overruns": self.overruns,
+            "jitter_mean_ms": mean * 1e3,
+            "jitter_std_ms": var**0.5 * 1e3,
+            "jitter_max_ms": self.jitter_max * 1e3,
+        }
+
+
 # --- DataReader Thread ---
 class DataReader(threading.Thread):
-    def __init__(self, data_q, error_q, app_ref, pause_event):  # pause_event 추가
+    def __init__(
+        self,
+        data_q,
+        error_q,
+        app_ref,
+        pause_event,
+        pipeline_depth=None,
+        sample_rate=None,
+        clock_offset=None,
+        port=None,
+    ):  # pause_event 추가
         threading.Thread.__init__(self, daemon=True)
         self.data_queue = data_q
         self.error_queue = error_q
@@ -52,6 +170,55 @@ class DataReader(threading.Thread):
         self.serial_connection = None
         self.running = True
         self.lock = threading.Lock()
+        # 연결별 수신 버퍼: 프레임 조각을 다음 read까지 유지
+        self.decoder = read.FrameDecoder()
+        # --- 파이프라인 폴링: depth > 1 이면 여러 요청을 동시에 보내고 응답 순서대로 매칭 ---
+        if pipeline_depth is None:
+            pipeline_depth = getattr(read, "PIPELINE_DEPTH", 1)
+        self.pipeline_depth = max(1, int(pipeline_depth))
+        self.in_flight = deque()  # 응답 대기 중인 요청: (송신 시각(monotonic), CAN ID)
+        self.last_rtt = None  # 마지막 요청-응답 왕복 시간 (seconds)
+        # --- Deadline 스케줄러: None 이면 링크 속도로 자유 폴링 ---
+        if sample_rate is None:
+            sample_rate = getattr(read, "SAMPLE_RATE", 0)
+        self.scheduler = DeadlineScheduler(sample_rate) if sample_rate else None
+        # 샘플 timestamp는 monotonic 송신 시각 + 이 offset (wall clock 기준)
+        # 여러 포트를 동시에 읽을 때는 같은 offset을 넘겨 시간축을 공유함
+        if clock_offset is None:
+            clock_offset = time.time() - time.monotonic()
+        self.clock_offset = clock_offset
+        self._last_replay_time = None  # 캡처 재생 시 마지막 샘플의 캡처 시각
+        # 추가 포트 reader: 샘플의 device 를 포트 이름으로 표시 (None = 기본 포트)
+        self.port = port
+        self.recorder = None  # TelemetryRecorder: 발행하는 모든 샘플을 파일로 기록
+        # --- Selective 요청: None 이면 전체 GetValues 요청 ---
+        # field_mask 는 GUI 가 요청한 mask, _active_mask 는 실제로 보내는 mask:
+        # 구형 펌웨어 fallback 은 이 연결에만 적용되고 새 연결마다 요청한 mask 로 복귀
+        self.field_mask = None
+        self._active_mask = None
+        self._mask_since = time.monotonic()  # mask 적용 후 첫 응답 대기 시작 시각
+        self._mask_confirmed = False
+        # --- CAN forwarding: None = 직접 연결된 장치, int = CAN ID ---
+        # can_ids/_requested_cycle 은 다른 스레드가 설정 (set_devices),
+        # 폴링 상태(_device_cycle 이하)는 이 스레드가 _apply_changes() 에서만 바꿈
+        self.can_ids = set()
+        self._requested_cycle = [None]  # 가중치를 반영한 폴링 순서
+        self._device_cycle = self._requested_cycle
+        self._cycle_pos = 0
+        self._polled_can_ids = set()
+        self._changes = set()  # 적용 대기 중인 변경: "connection", "devices", "mask"
+        self._retired = []  # 교체된 뒤 이 스레드가 닫을 포트 (읽는 중에 닫지 않도록)
+        self._exited = False
+        # --- 요청/응답 multiplexing: 포트 송수신은 이 스레드만 사용 ---
+        # 다른 스레드는 submit()으로 요청을, send()로 명령을 넣고 Future로 결과를 받음
+        # 송신 대기: (packet, entry, timeout, written), 명령은 entry None
+        self._outbox = deque()
+        # 다른 패킷보다 먼저 쓰고 flush 하는 STOP burst: (packet, written)
+        self._urgent = deque()
+        self._requests = (
+            {}
+        )  # 응답 packet ID -> deque[entry], entry = [Future, deadline]
+        self._wake = threading.Event()  # 송신 대기가 생기면 수신 대기를 중단
 
     def run(self):
         while self.running:
@@ -59,64 +226,581 @@ class DataReader(threading.Thread):
                 break
 
             # --- 수정: Event 기반 일시정지 ---
-            if self.app.pause_datareader:
+            if self._paused():
                 self.pause_event.set()  # "나 멈췄음" 신호 보내기
                 # print("DataReader: Paused event set.")
                 while (
-                    self.app.pause_datareader and self.running
+                    self._paused() and self.running
                 ):  # pause_datareader가 False가 되거나 running이 False가 될 때까지 대기
                     time.sleep(0.05)  # CPU 사용 방지하며 대기
                 self.pause_event.clear()  # "다시 시작함" 신호 해제
+                # 일시정지 동안의 텔레메트리 응답은 버림 (대기 중인 송신/요청은 유지:
+                # 포트는 이 스레드만 쓰므로 재개 후 그대로 송신)
+                self.decoder.reset()
+                self.in_flight.clear()
+                if self.scheduler:
+                    self.scheduler.resync()
                 # print("DataReader: Resuming, pause event cleared.")
                 continue  # 루프 시작으로 돌아가서 상태 다시 확인
-            connection = None
-            with self.lock:
-                connection = self.serial_connection
+            # 연결과 적용 대기 중인 변경을 같은 lock 안에서 읽음
+            connection = self._apply_changes()
             if not self.running:
                 break
             if connection and connection.is_open:
                 try:
-                    values = read.get_realtime_data(connection)
-                    if values:
-                        values.timestamp = time.time()
-                        self.data_queue.put(values)
+                    self._service_requests(connection)
+                    self._check_selective_fallback()
+                    if self.scheduler:
+                        self._poll_scheduled(connection)
+                    else:
+                        self._poll_pipelined(connection)
                 except serial.SerialException as se:
-                    msg = f"Serial Error(R):{se}"
                     # print(msg) # Avoid flooding
-                    with self.lock:
-                        if self.serial_connection:
-                            self.error_queue.put(msg)
-                            self.serial_connection = None
+                    self._connection_lost(
+                        connection, self._tag(f"Serial Error(R):{se}")
+                    )
                 except Exception as e:
-                    msg = f"DataReader Error:{e}"
-                    print(msg)
-                    traceback.print_exc()
-                    with self.lock:
-                        if self.serial_connection:
-                            self.error_queue.put(msg)
-                            self.serial_connection = None
-            if not self.running:
-                break
-            # --- Use try-except for hasattr/read.TIMEOUT in case read module changes ---
-            try:
-                sleep_time = read.TIMEOUT if hasattr(read, "TIMEOUT") else 0.05
-            except AttributeError:
-                sleep_time = 0.05
-            time.sleep(sleep_time)
-            # --- End try-except ---
-        print("DataReader thread terminated.")
+                    if self._connection_lost(
+                        connection, self._tag(f"DataReader Error:{e}")
+                    ):
+                        print(self._tag(f"DataReader Error:{e}"))
+                        traceback.print_exc()
+            elif self.running:
+                time.sleep(0.05)  # 연결 없음: CPU 사용 방지하며 대기
+        with self.lock:
+            self._exited = True
+        self._close_retired()
+        print(self._tag("DataReader thread terminated."))
+
+    def _connection_lost(self, connection, msg):
+        """Drops connection after an I/O error. Returns False if it had
+        already been replaced (disconnect/reconnect in the meantime)."""
+        with self.lock:
+            if self.serial_connection is not connection:
+                return False  # 새 연결과 그 요청은 유지
+            self.error_queue.put(msg)
+            self.serial_connection = None
+        self._fail_requests(msg)
+        return True
+
+    def _close_retired(self):
+        with self.lock:
+            retired, self._retired = self._retired, []
+        for ser in retired:
+            read.close_serial_port(ser)
+
+    def _tag(self, msg):
+        return f"[{self.port}] {msg}" if self.port else msg
+
+    def _apply_changes(self):
+        """Applies connection, device-list and field-mask changes requested
+        by other threads to the polling state, which only this thread
+        touches. Returns the current connection."""
+        self._close_retired()  # 이 스레드가 더 이상 읽지 않는 이전 포트
+        with self.lock:
+            connection = self.serial_connection
+            changes, self._changes = self._changes, set()
+            cycle, can_ids = self._requested_cycle, set(self.can_ids)
+            mask = self.field_mask
+        if not changes:
+            return connection
+        if changes & {"connection", "devices"}:
+            # 이전 연결/장치 목록에 보낸 요청의 응답은 매칭하지 않음
+            self.in_flight.clear()
+        if "connection" in changes:
+            self.decoder.reset()
+            self.last_rtt = None
+            self._last_replay_time = None
+            if self.scheduler:
+                self.scheduler.reset()  # 연결마다 새 통계 세션
+        if changes & {"connection", "mask"}:
+            self._active_mask = mask
+            self._mask_since = time.monotonic()
+            self._mask_confirmed = False
+        if "devices" in changes:
+            self._device_cycle = cycle
+            self._cycle_pos = 0
+            self._polled_can_ids = can_ids
+        return connection
+
+    def _paused(self):
+        # app.pause_datareader 는 기본 포트 reader 전용: 추가 포트 reader 는 자기 포트의
+        # 유일한 writer 라 기본 포트 연결 해제 중에도 STOP 을 써야 함 (stop() 으로 종료)
+        return self.port is None and self.app.pause_datareader
+
+    def _expire_in_flight(self, now):
+        # 응답이 오지 않은 오래된 요청은 유실된 것으로 보고 정리
+        while (
+            self.in_flight
+            and now - self.in_flight[0][0] > read.PIPELINE_RESPONSE_TIMEOUT
+        ):
+            self.in_flight.popleft()
+
+    def _match_in_flight(self, values):
+        """Finds the request a sample answers. Returns (send time or None, device).
+
+        CAN-forwarded replies come back unwrapped and may overtake local
+        ones, so with several devices the sample's controller ID selects the
+        oldest outstanding request for that device; otherwise FIFO order.
+        """
+        can_ids = self._polled_can_ids
+        cid = read.sample_controller_id(values) if can_ids else None
+        if cid is None:
+            if self.in_flight:
+                return self.in_flight.popleft()
+            return None, None
+        device = cid if cid in can_ids else None
+        for i, (sent, dev) in enumerate(self.in_flight):
+            if dev == device:
+                del self.in_flight[i]
+                return sent, device
+        return None, device  # 요청이 이미 만료됨
+
+    def _publish(self, samples):
+        """Stamps samples with their request time and device, and queues them."""
+        arrived = time.monotonic()
+        replay = self._replay_times(len(samples))
+        for i, values in enumerate(samples):
+            sent, device = self._match_in_flight(values)
+            if sent is None:
+                sent = arrived
+            self.last_rtt = arrived - sent
+            values.timestamp = sent + self.clock_offset if replay is None else replay[i]
+            values.device = device if self.port is None else self.port
+            self.data_queue.put(values)
+            rec = self.recorder
+            if rec:
+                rec.record(values)  # non-blocking
+        self._mask_confirmed = self._mask_confirmed or bool(samples)
+
+    def _replay_times(self, count):
+        """Capture-time stamps for count samples when replaying a capture
+        (spread evenly since the previous batch), else None."""
+        conn = self.serial_connection
+        now = getattr(conn, "replay_time", None)
+        if now is None or not count:
+            return None
+        prev = self._last_replay_time
+        prev = now if prev is None or prev > now else prev
+        self._last_replay_time = now
+        step = (now - prev) / count
+        return [conn.start_wall + prev + step * (i + 1) for i in range(count)]
+
+    def _send_requests(self, connection, count, now):
+        """Sends count requests to the next devices in the polling cycle."""
+        mask = self._active_mask
+        batch = []
+        for _ in range(count):
+            device = self._device_cycle[self._cycle_pos]
+            self._cycle_pos = (self._cycle_pos + 1) % len(self._device_cycle)
+            batch.append(read.encode_realtime_request(mask, device))
+            self.in_flight.append((now, device))
+        connection.write(b"".join(batch))
+
+    def set_devices(self, devices):
+        """Sets the polled devices as (can_id, weight) pairs; can_id None is
+        the directly attached VESC. Weights give each device's share of the
+        requests, interleaved by smooth weighted round-robin."""
+        devices = [(d, max(1, int(w))) for d, w in devices] or [(None, 1)]
+        current = {d: 0 for d, _ in devices}
+        total = sum(w for _, w in devices)
+        cycle = []
+        for _ in range(total):
+            for d, w in devices:
+                current[d] += w
+            pick = max(current, key=lambda d: current[d])
+            current[pick] -= total
+            cycle.append(pick)
+        with self.lock:
+            self.can_ids = {d for d, _ in devices if d is not None}
+            self._requested_cycle = cycle
+            self._changes.add("devices")  # reader 스레드가 다음 루프에서 적용
+
+    def _poll_pipelined(self, connection):
+        """Keeps pipeline_depth GetValues requests outstanding and matches
+        responses to requests in FIFO order."""
+        now = time.monotonic()
+        self._expire_in_flight(now)
+        missing = self.pipeline_depth - len(self.in_flight)
+        if missing > 0:
+            self._send_requests(connection, missing, now)
+        self._publish(self._receive(connection))
+
+    def _poll_scheduled(self, connection):
+        """Issues one request per scheduler deadline (at most pipeline_depth
+        outstanding) and spends the time until the next deadline receiving."""
+        sched = self.scheduler
+        now = time.monotonic()
+        self._expire_in_flight(now)
+        if sched.due(now):
+            if len(self.in_flight) < self.pipeline_depth:
+                self._send_requests(connection, 1, now)
+                sched.tick(now)
+            else:
+                sched.skip(now)  # 응답 대기 요청이 가득 참 -> 이번 샘플 건너뜀
+        self._publish(self._receive(connection, sched.time_until_next()))
+
+    def _receive(self, connection, timeout=read.REALTIME_READ_TIMEOUT):
+        """Reads frames for at most timeout. Telemetry samples are returned;
+        any other reply resolves the oldest request waiting for its ID."""
+        samples = []
+        frames = read.read_into_decoder(connection, self.decoder, timeout, self._wake)
+        for payload, msg in frames:
+            values = read.telemetry_sample(payload, msg)
+            if values is not None:
+                samples.append(values)
+            else:
+                self._resolve(payload)
+        return samples
+
+    def submit(self, packet, reply_id, timeout):
+        """Queues an encoded request for the port owned by this reader.
+
+        Returns a concurrent.futures.Future resolved with the payload of the
+        first reply whose packet ID is reply_id, or None after timeout
+        (counted from when the request is written). Telemetry polling keeps
+        running while the request is outstanding.
+        """
+        fut = Future()
+        entry = [fut, None]
+        with self.lock:
+            if not self.serial_connection:
+                fut.set_exception(serial.SerialException("Not connected."))
+                return fut
+            self._requests.setdefault(reply_id, deque()).append(entry)
+            self._outbox.append((packet, entry, timeout, None))
+            self._wake.set()
+        return fut
+
+    def send(self, packet, urgent=False):
+        """Queues an encoded command (no reply) for the port owned by this
+        reader. Returns a Future resolved with True once it is written.
+
+        urgent packets (the STOP burst) are written and flushed before
+        anything else, and commands still waiting are discarded so none
+        that was queued before a STOP can follow it.
+        """
+        fut = Future()
+        with self.lock:
+            if not self.serial_connection:
+                fut.set_exception(serial.SerialException("Not connected."))
+                return fut
+            if urgent:
+                dropped = [o[3] for o in self._outbox if o[1] is None]
+                self._outbox = deque(o for o in self._outbox if o[1] is not None)
+                self._urgent.append((packet, fut))
+            else:
+                dropped = []
+                self._outbox.append((packet, None, None, fut))
+            self._wake.set()
+        for old in dropped:
+            old.cancel()
+        return fut
+
+    def _service_requests(self, connection):
+        """Writes queued packets (urgent ones first) and times out
+        unanswered requests."""
+        now = time.monotonic()
+        with self.lock:
+            self._wake.clear()
+            urgent = list(self._urgent)
+            self._urgent.clear()
+            outgoing = list(self._outbox)
+            self._outbox.clear()
+            for _, entry, timeout, _ in outgoing:
+                if entry is not None:
+                    entry[1] = now + timeout
+            for waiting in self._requests.values():
+                while waiting and waiting[0][1] is not None and waiting[0][1] < now:
+                    self._set_future(waiting.popleft()[0], None)
+        if urgent:
+            self._write(connection, urgent, flush=True)
+        if outgoing:
+            self._write(connection, [(p, written) for p, _, _, written in outgoing])
+
+    def _write(self, connection, items, flush=False):
+        """Writes (packet, written Future or None) items as one burst."""
+        try:
+            connection.write(b"".join(packet for packet, _ in items))
+            if flush:
+                connection.flush()  # OS 송신 버퍼가 비워질 때까지 (wire 송신 시점)
+        except Exception as e:
+            for _, written in items:
+                if written is not None:
+                    self._set_future(written, exc=e)
+            raise
+        for _, written in items:
+            if written is not None:
+                self._set_future(written, True)
+
+    def _resolve(self, payload):
+        with self.lock:
+            waiting = self._requests.get(payload[0])
+            # 아직 송신 전인 요청(deadline None)은 이 응답의 주인이 아님
+            if waiting and waiting[0][1] is not None:
+                self._set_future(waiting.popleft()[0], bytes(payload))
+
+    def _fail_requests(self, reason):
+        """Fails every queued and outstanding request and command (port
+        lost/changed)."""
+        with self.lock:
+            futures = [e[0] for w in self._requests.values() for e in w]
+            futures += [o[3] for o in self._outbox if o[3] is not None]
+            futures += [written for _, written in self._urgent]
+            self._requests.clear()
+            self._outbox.clear()
+            self._urgent.clear()
+        for fut in futures:
+            self._set_future(fut, exc=serial.SerialException(reason))
+
+    @staticmethod
+    def _set_future(fut, result=None, exc=None):
+        try:
+            if exc is not None:
+                fut.set_exception(exc)
+            else:
+                fut.set_result(result)
+        except InvalidStateError:
+            pass  # 호출자가 취소함 (다른 스레드에서 언제든 가능)
+
+    def device_share(self, device):
+        """Fraction of the polled samples that come from device."""
+        with self.lock:
+            cycle = self._requested_cycle
+        return cycle.count(device) / len(cycle)
+
+    def expected_sample_rate(self):
+        """Sample rate used to size plot buffers (Hz)."""
+        if self.scheduler:
+            return self.scheduler.rate_hz
+        if self.pipeline_depth > 1:
+            return getattr(read, "PIPELINE_MAX_SAMPLE_RATE", 200)
+        return 1.0 / getattr(read, "TIMEOUT", 0.05)
+
+    def sampling_stats(self):
+        """Per-session sampling statistics (None when free-running)."""
+        if not self.scheduler:
+            return None
+        stats = self.scheduler.stats()
+        stats["rtt_ms"] = self.last_rtt * 1e3 if self.last_rtt is not None else None
+        return stats
+
+    def set_field_mask(self, mask):
+        """Requests only the GetValues fields in mask (None = full payload)."""
+        with self.lock:
+            self.field_mask = mask or None
+            self._changes.add("mask")  # reader 스레드가 다음 루프에서 적용
+
+    def _check_selective_fallback(self):
+        """Falls back to full GetValues for this connection if the firmware
+        never answers GET_VALUES_SELECTIVE (older firmware ignores the
+        command). Reader thread only."""
+        if self._active_mask is None or self._mask_confirmed:
+            return
+        if time.monotonic() - self._mask_since > read.SELECTIVE_FALLBACK_TIMEOUT:
+            self._active_mask = None
+            self.in_flight.clear()
+            self.error_queue.put(
+                self._tag("Info: No GET_VALUES_SELECTIVE reply, using full GetValues.")
+            )
 
     def stop(self):
-        print("Signaling DataReader stop...")
+        print(self._tag("Signaling DataReader stop..."))
         self.running = False
+        self._wake.set()  # 수신 대기 중이면 바로 종료
+
+    def set_serial_connection(self, ser, close=None):
+        """Switches to ser. close is a port to close (normally the one being
+        replaced); if this thread may still be reading it, it is closed here
+        once the read returns instead of by the caller."""
+        self._fail_requests("Connection changed.")
+        with self.lock:
+            in_use = close is self.serial_connection and self.is_alive()
+            if close is not None and in_use and not self._exited:
+                self._retired.append(close)
+                close = None
+            self.serial_connection = ser
+            self._changes.add("connection")  # 수신/폴링 상태는 reader 스레드가 초기화
+        if close is not None:
+            read.close_serial_port(close)  # reader 가 이미 놓은 포트 (I/O 오류 등)
+
+
+# --- Command Sender Thread ---
+# 우선순위 (낮을수록 먼저 송신)
+PRIORITY_STOP = 0
+PRIORITY_WAKE = 1  # setpoint 송신 재개 알림 (데이터 없음)
+STOP_WRITE_TIMEOUT = 0.5  # STOP burst 가 reader 에서 써질 때까지 기다리는 최대 시간
+
+
+class CommandSender(threading.Thread):
+    """Scheduler for all control traffic.
+
+    The emergency STOP (pre-encoded, one write per port) goes through a
+    priority queue and preempts everything else. Slider setpoints only overwrite the latest command for their control
+    mode and are sent once per period in between, which bounds bus load
+    and doubles as the firmware keepalive. Packets are handed to the
+    DataReader that owns the port, the only thread writing to it.
+    """
+
+    def __init__(self, error_q, reader, rate_hz=None):
+        threading.Thread.__init__(self, daemon=True)
+        self.error_queue = error_q
+        self.reader = reader  # 포트를 소유한 DataReader: 모든 송신은 그 outbox 로
+        if rate_hz is None:
+            rate_hz = getattr(read, "COMMAND_RATE", 20)
+        self.scheduler = DeadlineScheduler(rate_hz)
+        self.serial_connection = None  # 연결 상태 (실제 쓰기는 reader 가 함)
+        self.running = True
+        self.lock = threading.Lock()
+        self._queue = queue.PriorityQueue()  # (priority, seq, item)
+        self._seq = 0
+        self.stop_packet = (
+            read.encode_stop_burst()
+        )  # 누를 때 인코딩하지 않도록 미리 준비
+        self.stop_results = queue.Queue()  # (latency seconds, 포트 수) -> GUI 표시용
+        self.last_stop_latency = None
+        self._latest = {}  # control mode -> 최신 명령 (이전 값은 덮어씀)
+        self.mode = None  # 송신 중인 control mode (None = 송신 안 함)
+        self.sent = 0
+        self.coalesced = 0  # 송신되지 않고 덮어쓰인 setpoint 수
+        self._pending = False
+
+    def _put(self, priority, item):
+        with self.lock:
+            seq = self._seq
+            self._seq += 1
+        self._queue.put((priority, seq, item))
+
+    def set_setpoint(self, mode, command):
+        """Replaces the setpoint for mode and makes it the active one."""
+        with self.lock:
+            if self._pending and mode == self.mode:
+                self.coalesced += 1
+            idle = self.mode is None
+            self._latest[mode] = command
+            self.mode = mode
+            self._pending = True
+        if idle:
+            self._put(PRIORITY_WAKE, None)  # 대기 중인 루프를 바로 깨움
+
+    def clear(self):
+        """Stops transmitting setpoints (the writer thread keeps order, so
+        anything queued afterwards is sent after the last setpoint)."""
+        with self.lock:
+            self.mode = None
+            self._latest.clear()
+            self._pending = False
+
+    def emergency_stop(self, extra_readers=()):
+        """Drops setpoints and sends the STOP burst ahead of everything else, to the main port and to the ports of
+        extra_readers (each through the DataReader that owns it).
+
+        Returns a threading.Event that is set once the burst is written.
+        """
+        requested = time.perf_counter()
+        done = threading.Event()
+        with self.lock:
+            self.mode = None
+            self._latest.clear()
+            self._pending = False
+        self._put(PRIORITY_STOP, (requested, extra_readers, done))
+        return done
 
     def set_serial_connection(self, ser):
         with self.lock:
             self.serial_connection = ser
+            self.mode = None
+            self._latest.clear()
+            self._pending = False
+
+    def run(self):
+        while self.running:
+            try:
+                _, _, item = self._queue.get(timeout=self._setpoint_wait())
+            except queue.Empty:
+                item = None
+            if item is not None:
+                self._write_stop(*item)
+                continue  # 대기 중인 STOP 을 setpoint보다 먼저 처리
+            self._send_setpoint_if_due()
+        print("CommandSender thread terminated.")
+
+    def _setpoint_wait(self):
+        with self.lock:
+            active = self.mode is not None and self.serial_connection
+        if not active:
+            self.scheduler.resync()  # 새 setpoint가 오면 주기를 새로 시작
+            return 0.1
+        return self.scheduler.time_until_next()
+
+    def _send_setpoint_if_due(self):
+        if not self.scheduler.due():
+            return
+        with self.lock:
+            ser = self.serial_connection
+            command = self._latest.get(self.mode)
+            self._pending = False
+        if command is None or not ser:
+            return
+        self.scheduler.tick()
+        if self._write(encode(command), type(command).__name__):
+            self.sent += 1
+        else:
+            self.clear()  # 실패한 setpoint를 계속 재전송하지 않음
+
+    def _write_stop(self, requested, extra_readers, done):
+        readers = [self.reader] if self.serial_connection else []
+        readers += [r for r in extra_readers if r.serial_connection]
+        ports = 0
+        try:
+            # 각 reader 가 대기 중인 다른 패킷보다 먼저 쓰고 flush (포트별로 병렬)
+            pending = [r.send(self.stop_packet, urgent=True) for r in readers]
+            for written in pending:
+                if self._wait_written(written, "STOP"):
+                    ports += 1
+        finally:
+            done.set()
+        latency = time.perf_counter() - requested
+        self.last_stop_latency = latency
+        self.stop_results.put((latency, ports))
+
+    def _write(self, packet, name):
+        """Hands packet to the reader owning the port; False if not connected."""
+        fut = self.reader.send(packet)
+        exc = fut.exception() if fut.done() else None
+        if exc is not None:
+            self.error_queue.put(f"Send Fail:{name}: {exc}")
+            return False
+        return True
+
+    def _wait_written(self, fut, name):
+        try:
+            fut.result(STOP_WRITE_TIMEOUT)
+            return True
+        except Exception as e:
+            self.error_queue.put(f"Send Fail:{name}: {str(e) or 'write timeout'}")
+            return False
+
+    def stop(self):
+        self.running = False
+        self._put(PRIORITY_WAKE, None)
 
 
 # --- Main Application Class ---
 class App(customtkinter.CTk):
+    # update_labels 가 표시하는 GetValues 필드
+    LABEL_FIELDS = (
+        "v_in",
+        "duty_cycle_now",
+        "avg_motor_current",
+        "avg_input_current",
+        "rpm",
+        "temp_fet",
+        "mc_fault_code",
+    )
+    # 선택 가능한 플롯 시간 창 (seconds); 버퍼는 가장 긴 창 기준으로 할당
+    PLOT_WINDOWS = (15, 60, 120, 600)
+
     def __init__(self):
         super().__init__()
         self.update_idletasks()
@@ -145,34 +829,61 @@ class App(customtkinter.CTk):
         self.serial_connection = None
         self.loaded_mc_config = None
         self.loaded_app_config = None
+        self.config_cache = config_cache.ConfigCache()
+        self.device_key = None  # 마지막으로 설정을 읽은 장치의 캐시 키
+        self.config_digests = {}  # 장치 설정의 직렬화 payload 해시 (쓰기 skip 판단용)
         self.config_read_in_progress = False
         self.config_write_in_progress = False
         self.pause_datareader = False
+        self._pending_disconnect = (
+            None  # (port, log, STOP 송신 Event): STOP 대기 중인 연결 해제
+        )
         self.is_plotting = False
         self.plot_start_time = None
+        self._replay_end_logged = False
 
         # Data Handling
         self.data_queue = queue.Queue()
         self.error_queue = queue.Queue()
+        # 모든 포트의 샘플이 같은 시간축을 쓰도록 공유하는 monotonic -> wall clock offset
+        self.clock_offset = time.time() - time.monotonic()
         self.data_reader = DataReader(
-            self.data_queue, self.error_queue, self, self.datareader_pause_event
+            self.data_queue,
+            self.error_queue,
+            self,
+            self.datareader_pause_event,
+            clock_offset=self.clock_offset,
         )
+        # 슬라이더 setpoint 송신 (최신 값만 고정 주기로 전송, keepalive 겸용)
+        self.command_sender = CommandSender(self.error_queue, self.data_reader)
+        # 설정 읽기/쓰기 트랜잭션: 이벤트 루프 스레드 하나에서 coroutine 으로 실행
+        self.device_link = async_transport.AsyncLink(self.data_reader)
+        self.async_bridge = async_transport.TkBridge(self)
+        self.recorder = None  # 연결 중 텔레메트리 기록 (Record Telemetry 체크 시)
+        # 동시에 읽는 추가 포트: port name -> DataReader (기본 포트 제외)
+        self.port_readers = {}
+        # 플롯에 표시할 채널 (plot_channels registry 순서)
+        self.plot_channel_keys = list(plot_channels.DEFAULT_CHANNELS)
+        self._update_telemetry_mask()
 
         # Plotting Data
-        self.plot_update_interval = 100
+        # 플롯 갱신 주기: 프레임 렌더링 시간에 맞춰 CPU 예산 안에서 자동 조절
+        self.plot_governor = RefreshGovernor()
+        self._plot_stats_shown = 0.0  # 마지막 FPS 표시 시각
         self.plot_time_window = 15
-        # --- Use try-except for hasattr/read.TIMEOUT ---
-        try:
-            rt = read.TIMEOUT if hasattr(read, "TIMEOUT") else 0.05
-        except AttributeError:
-            rt = 0.05
-        # --- End try-except ---
-        self.plot_max_points = int(self.plot_time_window / rt) + 5
-        self.time_data = deque(maxlen=self.plot_max_points)
-        self.duty_data = deque(maxlen=self.plot_max_points)
-        self.current_data = deque(maxlen=self.plot_max_points)
-        self.plot_line_duty = None
-        self.plot_line_current = None
+        # 최신 샘플이 오른쪽 끝을 넘으면 x 구간을 창 길이의 이 비율만큼 앞으로 이동
+        # (이동할 때만 전체 redraw, 그 사이에는 blit)
+        self.plot_window_jump = 0.25
+        self._plot_xlim = None
+        # 툴바로 확대/이동하면 live 추적을 멈추고 세션 전체 pyramid 에서 그림
+        self._plot_follow = True
+        self._setting_xlim = False  # 직접 set_xlim 중 (xlim_changed 콜백 무시)
+        # 장치별 플롯 시리즈 (None = 기본 장치, CAN ID 또는 추가 포트 이름):
+        # 켜진 채널만 RingBuffer 하나(struct-of-arrays)에 저장, 매 프레임 view 로 그림
+        self.plot_series = {None: self._new_plot_series(None)}
+        self.plot_axes = {}  # channel group -> Axes (세로로 쌓고 x 축 공유)
+        self._plot_ylim = {}  # group -> autoscale 된 y 범위 (매 프레임 relim 안 함)
+        self.can_devices = []  # [(CAN ID, 가중치)], 로컬 장치 제외
 
         # GUI Setup
         self._setup_layout()
@@ -184,11 +895,77 @@ class App(customtkinter.CTk):
 
         # Start Background Tasks
         self.data_reader.start()
+        self.command_sender.start()
         self.process_queue()
-        self.after(self.plot_update_interval, self._trigger_plot_update)
+        self.after(self.plot_governor.interval_ms(), self._trigger_plot_update)
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         self._refresh_com_ports_action()
 
+    def _telemetry_fields(self):
+        """GetValues fields the GUI actually uses (labels + plotted channels)."""
+        fields = set(self.LABEL_FIELDS) | self._plot_fields()
+        if self.data_reader.can_ids:
+            fields.add("app_controller_id")  # CAN 응답을 장치별로 분리하는 데 필요
+        return fields
+
+    def _plot_fields(self):
+        return plot_channels.channel_fields(self.plot_channel_keys)
+
+    def _update_telemetry_mask(self):
+        if getattr(read, "USE_SELECTIVE_VALUES", False):
+            mask = read.selective_values_mask(self._telemetry_fields())
+            self.data_reader.set_field_mask(mask)
+            # 추가 포트는 직접 연결된 장치만 폴링하므로 controller ID 불필요
+            port_mask = read.selective_values_mask(
+                set(self.LABEL_FIELDS) | self._plot_fields()
+            )
+            for reader in self.port_readers.values():
+                reader.set_field_mask(port_mask)
+        else:
+            self.data_reader.set_field_mask(None)
+            for reader in self.port_readers.values():
+                reader.set_field_mask(None)
+
+    @staticmethod
+    def _parse_can_devices(text):
+        """Parses "1, 2:3" into [(1, 1), (2, 3)] (CAN ID, polling weight)."""
+        devices = []
+        for item in text.replace(";", ",").split(","):
+            item = item.strip()
+            if not item:
+                continue
+            can_id, _, weight = item.partition(":")
+            can_id, weight = int(can_id), int(weight or 1)
+            if not 0 <= can_id <= 254 or weight < 1:
+                raise ValueError(f"Invalid CAN device '{item}'")
+            if can_id not in [d for d, _ in devices]:
+                devices.append((can_id, weight))
+        return devices
+
+    def _apply_can_devices(self):
+        try:
+            devices = self._parse_can_devices(self.can_ids_var.get())
+        except ValueError as e:
+            return self._insert_log(f"CAN IDs Error: {e}", error=True)
+        if devices == self.can_devices:
+            return
+        self.can_devices = devices
+        self.data_reader.set_devices([(None, 1)] + devices)
+        self._update_telemetry_mask()
+        self._refresh_device_views()
+        if devices:
+            desc = ", ".join(f"{d}(x{w})" for d, w in devices)
+            self._insert_log(f"Polling CAN devices: {desc}")
+
+    def _extra_devices(self):
+        """Device keys shown besides the local VESC: CAN IDs and extra ports."""
+        return {d for d, _ in self.can_devices} | set(self.port_readers)
+
+    def _refresh_device_views(self):
+        devices = self._extra_devices()
+        self._rebuild_device_panels(devices)
+        self._rebuild_plot_series(devices)
+
     def _setup_layout(self):
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=10)
@@ -206,7 +983,7 @@ class App(customtkinter.CTk):
 
         # 행 간 간격을 위한 설정 (기존 spacer 행 대신 사용 가능)
         # self.sidebar_frame.grid_rowconfigure((0,1,2,3,4,5,6,7,8), pad=5) # 예시: 각 행 위아래 5픽셀 패딩
-        # self.sidebar_frame.grid_rowconfigure(9, weight=1) # 마지막 행은 여전히 확장용
+        # self.sidebar_frame.grid_rowconfigure(10, weight=1) # 마지막 행은 여전히 확장용
 
         self.logo_label = customtkinter.CTkLabel(
             self.sidebar_frame,
@@ -250,6 +1027,15 @@ class App(customtkinter.CTk):
             row=3, column=0, padx=20, pady=5
         )  # sticky 제거
 
+        # 기본 포트에 연결된 상태에서 선택한 포트를 추가로 열어 동시에 수집
+        self.sidebar_button_add_port = customtkinter.CTkButton(
+            self.sidebar_frame,
+            command=self._add_port_event,
+            text="Add Port",
+            state="disabled",
+        )
+        self.sidebar_button_add_port.grid(row=4, column=0, padx=20, pady=5)
+
         self.sidebar_button_disconnect = customtkinter.CTkButton(
             self.sidebar_frame,
             command=self.sidebar_button_disconnect,
@@ -258,7 +1044,7 @@ class App(customtkinter.CTk):
         )
         # --- 수정: sticky 제거 (가운데 정렬) ---
         self.sidebar_button_disconnect.grid(
-            row=4, column=0, padx=20, pady=5
+            row=5, column=0, padx=20, pady=5
         )  # sticky 제거
 
         self.sidebar_is_connected = customtkinter.CTkLabel(
@@ -268,7 +1054,7 @@ class App(customtkinter.CTk):
             font=customtkinter.CTkFont(weight="bold"),
         )
         # --- 수정: sticky 제거 (가운데 정렬) ---
-        self.sidebar_is_connected.grid(row=5, column=0, padx=20, pady=10)  # sticky 제거
+        self.sidebar_is_connected.grid(row=6, column=0, padx=20, pady=10)  # sticky 제거
 
         # Config Read/Write Section
         self.sidebar_button_read_all = customtkinter.CTkButton(
@@ -279,7 +1065,7 @@ class App(customtkinter.CTk):
         )
         # --- 수정: sticky 제거 (가운데 정렬) ---
         self.sidebar_button_read_all.grid(
-            row=6, column=0, padx=20, pady=10
+            row=7, column=0, padx=20, pady=10
         )  # sticky 제거
 
         self.sidebar_button_write_all = customtkinter.CTkButton(
@@ -290,12 +1076,63 @@ class App(customtkinter.CTk):
         )
         # --- 수정: sticky 제거 (가운데 정렬) ---
         self.sidebar_button_write_all.grid(
-            row=7, column=0, padx=20, pady=10
+            row=8, column=0, padx=20, pady=10
         )  # sticky 제거
 
+        # 체크 시 이 장치에서 마지막으로 읽거나 쓴 설정을 캐시에서 불러옴 (전송 생략).
+        # 다른 도구로 바꾼 설정은 감지되지 않으므로 기본값은 항상 장치에서 읽기
+        opt_frame = customtkinter.CTkFrame(self.sidebar_frame, fg_color="transparent")
+        opt_frame.grid(row=9, column=0, padx=20, pady=(0, 10))
+        self.use_config_cache = customtkinter.BooleanVar(value=False)
+        self.sidebar_check_cache = customtkinter.CTkCheckBox(
+            opt_frame,
+            text="Use Config Cache",
+            variable=self.use_config_cache,
+        )
+        self.sidebar_check_cache.pack()
+        customtkinter.CTkLabel(
+            opt_frame,
+            text="Cached values may be stale",
+            text_color=("gray60", "gray50"),
+            font=customtkinter.CTkFont(size=11),
+        ).pack(pady=(0, 10))
+
+        # CAN 버스 뒤의 장치 목록: "ID[:가중치]" 콤마 구분 (예: "1, 2:2")
+        self.can_ids_var = customtkinter.StringVar(value="")
+        self.sidebar_entry_can = customtkinter.CTkEntry(
+            opt_frame,
+            textvariable=self.can_ids_var,
+            placeholder_text="CAN IDs (e.g. 1, 2:2)",
+        )
+        self.sidebar_entry_can.pack()
+
+        # 연결 시 시리얼 송수신 원시 바이트를 파일로 기록 / 기록 파일 재생
+        self.capture_serial = customtkinter.BooleanVar(value=False)
+        self.sidebar_check_capture = customtkinter.CTkCheckBox(
+            opt_frame, text="Capture Serial", variable=self.capture_serial
+        )
+        self.sidebar_check_capture.pack(pady=(10, 5))
+        self.sidebar_button_replay = customtkinter.CTkButton(
+            opt_frame, text="Replay Capture...", command=self._replay_capture_event
+        )
+        self.sidebar_button_replay.pack()
+        # 연결 동안 모든 텔레메트리 샘플을 memory-mapped 파일로 기록 (장시간 시험용)
+        self.record_telemetry = customtkinter.BooleanVar(value=False)
+        self.sidebar_check_record = customtkinter.CTkCheckBox(
+            opt_frame, text="Record Telemetry", variable=self.record_telemetry
+        )
+        self.sidebar_check_record.pack(pady=(10, 5))
+        # 압축 chunk 세션 파일(.rses)로 기록: 수 시간 기록해도 수십 MB
+        self.compress_recording = customtkinter.BooleanVar(value=True)
+        self.sidebar_check_compress = customtkinter.CTkCheckBox(
+            opt_frame, text="Compress Recording", variable=self.compress_recording
+        )
+        self.sidebar_check_compress.pack()
+        self.sidebar_entry_can.bind("<Return>", lambda e: self._apply_can_devices())
+        self.sidebar_entry_can.bind("<FocusOut>", lambda e: self._apply_can_devices())
+
         # --- 빈 행 추가 (선택 사항: 간격 조절) ---
-        # self.sidebar_frame.grid_rowconfigure(8, minsize=20) # 8번 행에 최소 높이 지정
-        self.sidebar_frame.grid_rowconfigure(9, weight=1)  # 확장용 빈 행 (기존 유지)
+        self.sidebar_frame.grid_rowconfigure(10, weight=1)  # 확장용 빈 행 (기존 유지)
         # --- 빈 행 추가 끝 ---
 
         # Appearance Section (Bottom)
@@ -306,7 +1143,7 @@ class App(customtkinter.CTk):
         )
         # --- 수정: sticky='ew' 또는 제거 (레이블은 텍스트 때문에 가운데 정렬 효과 적음) ---
         self.appearance_mode_label.grid(
-            row=10, column=0, padx=20, pady=(10, 0), sticky="w"
+            row=11, column=0, padx=20, pady=(10, 0), sticky="w"
         )  # 왼쪽 정렬 유지 또는 sticky 제거
 
         self.appearance_mode_optionemenu = customtkinter.CTkOptionMenu(
@@ -316,7 +1153,7 @@ class App(customtkinter.CTk):
         )
         # --- 수정: sticky 제거 (가운데 정렬) ---
         self.appearance_mode_optionemenu.grid(
-            row=11, column=0, padx=20, pady=(0, 10)
+            row=12, column=0, padx=20, pady=(0, 10)
         )  # sticky 제거
 
         self.scaling_label = customtkinter.CTkLabel(
@@ -326,7 +1163,7 @@ class App(customtkinter.CTk):
         )
         # --- 수정: sticky='ew' 또는 제거 ---
         self.scaling_label.grid(
-            row=12, column=0, padx=20, pady=(0, 0), sticky="w"
+            row=13, column=0, padx=20, pady=(0, 0), sticky="w"
         )  # 왼쪽 정렬 유지 또는 sticky 제거
 
         self.scaling_optionemenu = customtkinter.CTkOptionMenu(
@@ -336,7 +1173,7 @@ class App(customtkinter.CTk):
         )
         # --- 수정: sticky 제거 (가운데 정렬) ---
         self.scaling_optionemenu.grid(
-            row=13, column=0, padx=20, pady=(0, 20)
+            row=14, column=0, padx=20, pady=(0, 20)
         )  # sticky 제거
 
     def _create_main_tabs_and_plot(self):
@@ -366,12 +1203,11 @@ class App(customtkinter.CTk):
         self._update_plot_theme_params()
         self.plot_figure = Figure(figsize=(5, 3), dpi=100)
         self.plot_figure.set_facecolor(plt.rcParams["figure.facecolor"])
-        self.ax_duty = self.plot_figure.add_subplot(111)
-        self.ax_current = self.ax_duty.twinx()
-        self._setup_plot_axes()
         self.plot_canvas = FigureCanvasTkAgg(self.plot_figure, master=pt)
         self.plot_canvas_widget = self.plot_canvas.get_tk_widget()
         self.plot_canvas_widget.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.plot_blit = BlitManager(self.plot_canvas)
+        self._rebuild_plot()
         tf = customtkinter.CTkFrame(pt, fg_color="transparent")
         tf.grid(row=1, column=0, sticky="ew", padx=5, pady=(0, 5))
         try:
@@ -400,6 +1236,24 @@ class App(customtkinter.CTk):
             state="disabled",
         )
         self.plot_stop_button.pack(side=tkinter.LEFT, padx=10)
+        self.plot_window_menu = customtkinter.CTkOptionMenu(
+            bf,
+            values=[f"{w} s" for w in self.PLOT_WINDOWS],
+            command=self._plot_window_event,
+            width=90,
+        )
+        self.plot_window_menu.set(f"{self.plot_time_window} s")
+        self.plot_window_menu.pack(side=tkinter.LEFT, padx=10)
+        self.plot_live_button = customtkinter.CTkButton(
+            bf, text="Follow Live", command=self._plot_follow_live, width=90
+        )
+        self.plot_live_button.pack(side=tkinter.LEFT, padx=10)
+        self.plot_channels_button = customtkinter.CTkButton(
+            bf, text="Channels...", command=self._plot_channels_event, width=90
+        )
+        self.plot_channels_button.pack(side=tkinter.LEFT, padx=10)
+        self.plot_stats_label = customtkinter.CTkLabel(bf, text="", width=220)
+        self.plot_stats_label.pack(side=tkinter.LEFT, padx=10)
         ct = self.tabview.tab("Console")
         ct.grid_columnconfigure(0, weight=1)
         ct.grid_rowconfigure(0, weight=1)
@@ -409,13 +1263,24 @@ class App(customtkinter.CTk):
         self.textbox.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         self._insert_log("Console Output:\n")
 
+    # 실시간 레이블: (이름, 표시 텍스트)
+    RT_LABELS = (
+        ("voltage", "V In"),
+        ("duty", "Duty"),
+        ("mot_curr", "Mot Curr"),
+        ("batt_curr", "Batt Curr"),
+        ("erpm", "ERPM"),
+        ("temp_mos", "MOS Temp"),
+        ("power", "Power"),
+        ("fault", "Fault"),
+    )
+
     def _create_realtime_panel(self):
         rt_frame = customtkinter.CTkFrame(self)
         rt_frame.grid(
             row=0, column=2, rowspan=2, padx=(10, 20), pady=(20, 10), sticky="nsew"
         )
-        rt_frame.grid_columnconfigure(0, weight=1)  # 항목 레이블 열
-        rt_frame.grid_columnconfigure(1, weight=0)  # 값 레이블 열
+        rt_frame.grid_columnconfigure(0, weight=1)
 
         rt_title = customtkinter.CTkLabel(
             rt_frame,
@@ -424,7 +1289,35 @@ class App(customtkinter.CTk):
         )
         # Title row - no weight needed unless you want it to take up specific space
         rt_frame.grid_rowconfigure(0, weight=0)
-        rt_title.grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 15))
+        rt_title.grid(row=0, column=0, padx=10, pady=(10, 15))
+
+        # --- 장치별 레이블 패널 (직접 연결 장치 + CAN 장치) ---
+        rt_frame.grid_rowconfigure(1, weight=1)
+        self.rt_tabview = customtkinter.CTkTabview(rt_frame)
+        self.rt_tabview.grid(row=1, column=0, padx=5, pady=(0, 5), sticky="nsew")
+        self.device_labels = {}  # device -> {label name: value widget}
+        self._add_device_panel(None)
+        # 직접 연결된 장치의 레이블은 기존 이름(real_*_read)으로도 접근
+        for name, widget in self.device_labels[None].items():
+            setattr(self, f"real_{name}_read", widget)
+
+    @staticmethod
+    def _device_name(device):
+        if device is None:
+            return "Local"
+        if isinstance(device, str):  # 추가 포트
+            return device.replace("\\", "/").rsplit("/", 1)[-1]
+        return f"CAN {device}"
+
+    @staticmethod
+    def _device_order(device):
+        # CAN ID(int)와 포트 이름(str)이 섞여 있어도 정렬 가능하도록
+        return (isinstance(device, str), str(device).zfill(3))
+
+    def _add_device_panel(self, device):
+        tab = self.rt_tabview.add(self._device_name(device))
+        tab.grid_columnconfigure(0, weight=1)  # 항목 레이블 열
+        tab.grid_columnconfigure(1, weight=0)  # 값 레이블 열
 
         def create_rt_label_pair(parent, text, row):
             # --- 각 데이터 행에 weight=1 부여 ---
@@ -453,35 +1346,19 @@ class App(customtkinter.CTk):
             lbl_value.grid(row=row, column=1, padx=(5, 15), pady=5)  # pady 증가
             return lbl_value
 
-        # --- 각 항목 생성 및 배치 ---
-        current_row = 1  # Start data rows from 1
-        self.real_voltage_read = create_rt_label_pair(rt_frame, "V In", current_row)
-        current_row += 1
-        self.real_duty_read = create_rt_label_pair(rt_frame, "Duty", current_row)
-        current_row += 1
-        self.real_mot_curr_read = create_rt_label_pair(
-            rt_frame, "Mot Curr", current_row
-        )
-        current_row += 1
-        self.real_batt_curr_read = create_rt_label_pair(
-            rt_frame, "Batt Curr", current_row
-        )
-        current_row += 1
-        self.real_erpm_read = create_rt_label_pair(rt_frame, "ERPM", current_row)
-        current_row += 1
-        self.real_temp_mos_read = create_rt_label_pair(
-            rt_frame, "MOS Temp", current_row
-        )
-        current_row += 1
-        self.real_power_read = create_rt_label_pair(rt_frame, "Power", current_row)
-        current_row += 1
-        self.real_fault_read = create_rt_label_pair(rt_frame, "Fault", current_row)
-        current_row += 1
+        self.device_labels[device] = {
+            name: create_rt_label_pair(tab, text, row)
+            for row, (name, text) in enumerate(self.RT_LABELS)
+        }
 
-        # --- 마지막 Spacer 행 제거 또는 weight=1로 설정 ---
-        # rt_frame.grid_rowconfigure(current_row, weight=1) # 이 줄은 이제 필요 없음 (모든 데이터 행이 weight=1을 가짐)
-        # 만약 데이터 항목 아래에 추가 공간이 필요하면 유지하되, 필요 없으면 제거합니다.
-        # 여기서는 제거하겠습니다.
+    def _rebuild_device_panels(self, devices):
+        for device in [d for d in self.device_labels if d is not None]:
+            if device not in devices:
+                self.rt_tabview.delete(self._device_name(device))
+                del self.device_labels[device]
+        for device in sorted(devices, key=self._device_order):
+            if device not in self.device_labels:
+                self._add_device_panel(device)
 
     def _create_control_panel(self):
         cpf = customtkinter.CTkFrame(self)
@@ -572,6 +1449,11 @@ class App(customtkinter.CTk):
             state="disabled",
         )
         self.stop_button.pack(pady=(15, 5))
+        # STOP 버튼 누름 -> 송신 완료까지 걸린 시간
+        self.stop_latency_label = customtkinter.CTkLabel(
+            rpmf, text="STOP: -- ms", text_color=("gray40", "gray60")
+        )
+        self.stop_latency_label.pack(pady=(0, 5))
 
     def _set_initial_states(self):
         self.com_port_optionmenu.set("Select Port")
@@ -680,8 +1562,17 @@ class App(customtkinter.CTk):
 
     def _connection_success(self, ser_obj, port_name):
         self._insert_log(f"Connected to {port_name}.")
+        self._replay_end_logged = False
+        if self.capture_serial.get() and not isinstance(ser_obj, capture.ReplaySerial):
+            try:
+                ser_obj = capture.CaptureSerial(ser_obj)
+                self._insert_log(f"Capturing serial traffic to {ser_obj.path}")
+            except OSError as e:
+                self._insert_log(f"Capture Error: {e}", error=True)
         self.serial_connection = ser_obj
+        self._start_recording()
         self.data_reader.set_serial_connection(ser_obj)
+        self.command_sender.set_serial_connection(ser_obj)
         self._update_ui_connection_state(connected=True)
 
     def _connection_failure(self, port_name, err_msg):
@@ -689,13 +1580,129 @@ class App(customtkinter.CTk):
         tkinter.messagebox.showerror("Connection Error", err_msg)
         self.serial_connection = None
         self.data_reader.set_serial_connection(None)
+        self.command_sender.set_serial_connection(None)
         self._update_ui_connection_state(connected=False)
 
+    def _ask_replay_number(self, prompt, default, low, high):
+        """Asks for a number in [low, high] (high None: no upper bound).
+        Returns None if cancelled or invalid (after showing an error)."""
+        text = customtkinter.CTkInputDialog(text=prompt, title="Replay").get_input()
+        if text is None:
+            return None
+        try:
+            value = float(text or default)
+        except ValueError as e:
+            tkinter.messagebox.showerror("Replay Error", f"{e}")
+            return None
+        if value < low or (high is not None and value > high):
+            tkinter.messagebox.showerror("Replay Error", f"Out of range: {value:g}")
+            return None
+        return value
+
+    def _replay_capture_event(self):
+        if self.serial_connection or self._pending_disconnect:
+            return tkinter.messagebox.showwarning("Replay", "Disconnect first.")
+        path = tkinter.filedialog.askopenfilename(
+            title="Replay Capture",
+            initialdir=(
+                capture.CAPTURE_DIR if os.path.isdir(capture.CAPTURE_DIR) else None
+            ),
+            filetypes=[("Serial capture", "*.rcap"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            reader = capture.CaptureReader(path)
+            length = reader.duration()
+            reader.close()
+        except (OSError, ValueError) as e:
+            return tkinter.messagebox.showerror("Replay Error", f"{e}")
+        speed = self._ask_replay_number(
+            "Replay speed (1 = real time, 10 = 10x, 0 = max):", 1, 0, None
+        )
+        if speed is None:
+            return
+        # 시작 위치: index 로 해당 시각 직전 record 부터 읽음
+        start = self._ask_replay_number(
+            f"Start at (s, 0 - {length:.1f}):", 0, 0, length
+        )
+        if start is None:
+            return
+        try:
+            ser = capture.ReplaySerial(path, speed, start)
+        except (OSError, ValueError) as e:
+            return tkinter.messagebox.showerror("Replay Error", f"{e}")
+        rate = f"{speed:g}x" if speed else "max"
+        self._insert_log(f"Replaying {path} at {rate} speed from {start:g} s.")
+        self._connection_success(ser, os.path.basename(path))
+
+    def _add_port_event(self):
+        port = self.selected_com_port.get()
+        if not port or "select" in port.lower() or "found" in port.lower():
+            return tkinter.messagebox.showwarning("Add Port", "Select valid port.")
+        if not self.serial_connection or not self.serial_connection.is_open:
+            return tkinter.messagebox.showerror("Add Port", "Connect first.")
+        if port == self.serial_connection.port or port in self.port_readers:
+            return self._insert_log(f"Warn: {port} already open.", error=True)
+        self._insert_log(f"Adding port {port}...")
+        threading.Thread(
+            target=self._attempt_port_connection, args=(port,), daemon=True
+        ).start()
+
+    def _attempt_port_connection(self, port):
+        try:
+            ser = serial.Serial(port, baudrate=115200, timeout=0.5)
+            self.after(0, self._port_connection_success, ser, port)
+        except (serial.SerialException, Exception) as e:
+            err = f"Conn fail {port}:{e}"
+            print(err)
+            self.after(0, self._insert_log, err, True)
+
+    def _port_connection_success(self, ser_obj, port_name):
+        if not self.serial_connection or port_name in self.port_readers:
+            read.close_serial_port(ser_obj)  # 그 사이 연결 해제됨
+            return
+        # 포트마다 독립 reader 스레드, 큐와 시간축은 공유
+        reader = DataReader(
+            self.data_queue,
+            self.error_queue,
+            self,
+            threading.Event(),
+            clock_offset=self.clock_offset,
+            port=port_name,
+        )
+        self.port_readers[port_name] = reader
+        reader.recorder = self.recorder
+        self._update_telemetry_mask()
+        reader.set_serial_connection(ser_obj)
+        reader.start()
+        self._refresh_device_views()
+        self._insert_log(f"Connected to {port_name} (extra port).")
+
+    def _close_extra_ports(self, log=True):
+        readers, self.port_readers = self.port_readers, {}
+        for reader in readers.values():
+            self._log_sampling_stats(reader) if log else None
+            reader.stop()
+        for reader in readers.values():
+            # reader 의 마지막 쓰기가 끝난 뒤에야 이 스레드에서 포트에 씀
+            reader.join(timeout=0.5)
+            ser = reader.serial_connection
+            if ser and not reader.is_alive():
+                try:  # 연결 해제 시 추가 포트의 모터도 정지
+                    read.send_command(ser, SetCurrent(0))
+                except Exception:
+                    pass
+            # join 이 시간 초과면 reader 가 종료하면서 닫음
+            reader.set_serial_connection(None, close=ser)
+        if readers:
+            self._refresh_device_views()
+
     def sidebar_button_disconnect(self):
         self._insert_log("Disconnecting...")
         self._handle_disconnection(log=True)
 
-    def _handle_disconnection(self, log=True):
+    def _handle_disconnection(self, log=True, block=False):
         msg = (
             f"Closing connection to {self.serial_connection.port}."
             if self.serial_connection and self.serial_connection.is_open
@@ -703,19 +1710,80 @@ class App(customtkinter.CTk):
         )
         self._insert_log(msg) if log else None
         self.is_plotting = False
-        self.pause_datareader = True
-        if self.serial_connection and self.serial_connection.is_open:
-            self.stop_button_event(log=False)
-        ser_close = self.serial_connection
+        ser = self.serial_connection
+        if not ser or not ser.is_open:
+            self._pending_disconnect = (ser, log, None)
+            return self._finish_disconnection(self._pending_disconnect)
+        # 포트를 닫기 전에 STOP burst가 실제로 써질 때까지 대기 (DataReader 가 쓰므로
+        # 일시정지보다 먼저). Tk 스레드를 막지 않도록 대기는 worker 에서 하고
+        # 그동안 UI 는 연결 해제 중 상태 (block=True 는 앱 종료 시)
+        done = self.stop_button_event(log=False)
+        pending = self._pending_disconnect = (ser, log, done)
         self.serial_connection = None
-        self.data_reader.set_serial_connection(None)
-        read.close_serial_port(ser_close) if ser_close else None
+        self._update_ui_connection_state(disconnecting=True)
+        if block:
+            done.wait(2 * STOP_WRITE_TIMEOUT)
+            return self._finish_disconnection(pending)
+
+        def wait_stop():
+            done.wait(2 * STOP_WRITE_TIMEOUT)
+            self.after(0, self._finish_disconnection, pending)
+
+        threading.Thread(target=wait_stop, daemon=True).start()
+
+    def _finish_disconnection(self, pending):
+        if pending is not self._pending_disconnect:
+            return  # 이미 정리됨 (대기 중 앱 종료)
+        self._pending_disconnect = None
+        ser_close, log, _ = pending
+        self.pause_datareader = True
+        self._log_sampling_stats() if log else None
+        self._close_extra_ports(log)
+        self.command_sender.set_serial_connection(None)
+        self.data_reader.set_serial_connection(None, close=ser_close)
+        self._stop_recording()
         self.pause_datareader = False
         self._update_ui_connection_state(connected=False)
         self.after(50, self.update_labels, None)
         self._reset_plot()
         self._insert_log("Disconnected.") if log else None
 
+    def _start_recording(self):
+        if not self.record_telemetry.get():
+            return
+        try:
+            self.recorder = recorder.TelemetryRecorder(
+                compressed=self.compress_recording.get()
+            )
+        except OSError as e:
+            return self._insert_log(f"Record Error: {e}", error=True)
+        self.recorder.start()
+        self.data_reader.recorder = self.recorder
+        self._insert_log(f"Recording telemetry to {self.recorder.path}")
+
+    def _stop_recording(self):
+        rec, self.recorder = self.recorder, None
+        if not rec:
+            return
+        self.data_reader.recorder = None
+        rec.stop()
+        self._insert_log(
+            f"Recorded {rec.count} samples ({rec.dropped} dropped) to {rec.path}"
+        )
+
+    def _log_sampling_stats(self, reader=None):
+        reader = reader or self.data_reader
+        st = reader.sampling_stats()
+        if not st or not st["ticks"]:
+            return
+        self._insert_log(
+            f"{reader.port + ' ' if reader.port else ''}"
+            f"Sampling: {st['actual_hz']:.1f}/{st['target_hz']:.0f} Hz, "
+            f"jitter mean {st['jitter_mean_ms']:.2f} ms "
+            f"(std {st['jitter_std_ms']:.2f}, max {st['jitter_max_ms']:.2f}), "
+            f"overruns {st['overruns']}, skipped {st['skipped']}"
+        )
+
     def read_all_configurations_event(self):
         if not self.serial_connection or not self.serial_connection.is_open:
             return tkinter.messagebox.showerror("Error", "Connect first.")
@@ -723,59 +1791,66 @@ class App(customtkinter.CTk):
             return self._insert_log("Warn: Config busy.", error=True)
         self._insert_log("Reading configs...")
         self.config_read_in_progress = True
-        self.pause_datareader = True
         self._update_config_button_states()
-        threading.Thread(target=self._read_configs_worker, daemon=True).start()
+        self.async_bridge.run(
+            self._read_configs(self.use_config_cache.get()),
+            lambda result: self._read_configs_finished(*result),
+        )
 
-    def _read_configs_worker(self):
+    async def _read_configs(self, use_cache=True):
         mc, app, err = None, None, None
+        sources = {}  # 설정별 출처: "cache" 또는 "device"
+        key = None
         ser = self.serial_connection
 
-        # --- 추가: DataReader가 멈출 때까지 대기 ---
-        # pause_datareader는 이미 True로 설정됨
-        # print("Worker: Waiting for DataReader pause...")
-        paused = self.datareader_pause_event.wait(timeout=0.5)  # 최대 0.5초 대기
-        if not paused:
-            err = "Timeout waiting for DataReader to pause."
-            print(f"Warning: {err}")  # 로그 남기고 계속 진행하거나 에러 처리 가능
+        # DataReader가 포트를 계속 소유하고 요청을 텔레메트리 폴링 사이에 끼워 보냄
+        # (읽는 동안에도 플롯/레이블 갱신이 멈추지 않음)
+        if not ser or not ser.is_open:
+            err = "Connection lost before read."
         else:
-            # print("Worker: DataReader confirmed paused.")
-            pass
-        # --- 추가 끝 ---
-
-        # --- 나머지 로직 (이전과 거의 동일, 완료 시 pause 해제) ---
-        if err is None:  # Pause 대기 성공 시에만 진행 (선택적)
-            if not ser or not ser.is_open:
-                err = "Connection lost before read."
-            else:
-                try:
-                    mc = read.get_mc_configuration(ser)
-                    if mc:
-                        time.sleep(0.1)
-                        app = read.get_app_configuration(ser)
-                    if not mc:
-                        err = "Failed MC read."
-                    elif not app:
-                        err = "Failed APP read (after MC OK)."
-                except serial.SerialException as se:
-                    err = f"Serial Error reading configs: {se}"
-                    self.error_queue.put(err)
-                    print(err)
-                except Exception as e:
-                    err = f"Unexpected error reading configs: {e}"
-                    traceback.print_exc()
+            try:
+                # 장치 식별 (짧은 프레임 하나) -> 캐시 키
+                fw_info = await self.device_link.fw_info()
+                key = config_cache.device_key(fw_info)
+                mc = await self._read_config_cached(key, "mcconf", use_cache, sources)
+                if mc:
+                    app = await self._read_config_cached(
+                        key, "appconf", use_cache, sources
+                    )
+                if not mc:
+                    err = "Failed MC read."
+                elif not app:
+                    err = "Failed APP read (after MC OK)."
+            except serial.SerialException as se:
+                err = f"Serial Error reading configs: {se}"
+                self.error_queue.put(err)
+                print(err)
+            except Exception as e:
+                err = f"Unexpected error reading configs: {e}"
+                traceback.print_exc()
 
-        # 작업 완료 또는 실패 시 메인 스레드 콜백 호출 및 Pause 해제
+        # 작업 완료 또는 실패: bridge 가 메인 스레드에서 _read_configs_finished 호출
         self.config_read_in_progress = False  # 상태 플래그 리셋
-        self.pause_datareader = (
-            False  # DataReader 다시 활성화 (이후 루프에서 Event 자동 해제됨)
-        )
-        self.after(0, self._read_configs_finished, mc, app, err)
-
-    def _read_configs_finished(self, mc, app, err):
+        return mc, app, err, key, sources
+
+    async def _read_config_cached(self, key, kind, use_cache, sources):
+        """Loads one config from the cache if this device/firmware has an
+        entry, otherwise reads it from the device and refreshes the cache."""
+        if use_cache:
+            hit = self.config_cache.load(key, kind)
+            if hit:
+                parsed, _, saved_at = hit
+                saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(saved_at or 0))
+                sources[kind] = f"cache (saved {saved}, may be stale)"
+                return parsed
+        conf, raw = await self.device_link.read_config(kind)
+        if conf:
+            sources[kind] = "device"
+            self.config_cache.store(key, kind, conf, raw)
+        return conf
+
+    def _read_configs_finished(self, mc, app, err, key=None, sources=None):
         """Callback after config read attempt."""
-        # self.config_read_in_progress = False # Worker thread now handles this
-        # self.pause_datareader = False      # Worker thread now handles this
         self._update_config_button_states()  # Update button states based on config_read_in_progress
         menu = getattr(self, "optionmenu_1", None)
         if err:
@@ -787,6 +1862,13 @@ class App(customtkinter.CTk):
         elif mc and app:
             self.loaded_mc_config = mc
             self.loaded_app_config = app
+            self.device_key = key
+            self._update_config_digests(mc, app, sources)
+            if sources:
+                self._insert_log(
+                    "Config source: "
+                    + ", ".join(f"{k.upper()} from {v}" for k, v in sources.items())
+                )
             self._insert_log("Configs read successfully.")
             self._update_gui_with_config()
             tkinter.messagebox.showinfo("Read Success", "Configs read!")
@@ -810,92 +1892,146 @@ class App(customtkinter.CTk):
             return tkinter.messagebox.showerror("Error", "Read configs first.")
         if not all([SetMcConf, SetAppConf, encode_set_mcconf, encode_set_appconf]):
             return tkinter.messagebox.showerror("Error", "pyvesc write missing.")
-        if not tkinter.messagebox.askyesno(
-            "Confirm Write", "Overwrite VESC configs?", icon="warning"
-        ):
-            return self._insert_log("Write cancelled.")
-        self._insert_log("Writing configs...")
-        self.config_write_in_progress = True
-        self.pause_datareader = True
-        self._update_config_button_states()
         mc_w = self._get_mc_config_from_gui()
         app_w = self._get_app_config_from_gui()
         if not mc_w or not app_w:
             self._insert_log("Write Error: Bad GUI config.", error=True)
             tkinter.messagebox.showerror("Write Error", "Cannot get GUI settings.")
-            self.config_write_in_progress = False
-            self.pause_datareader = False
-            self._update_config_button_states()
             return
-        threading.Thread(
-            target=self._write_configs_worker, args=(mc_w, app_w), daemon=True
-        ).start()
+        # --- 직렬화된 payload 해시를 마지막으로 읽은/쓴 값과 비교, 바뀐 것만 쓰기 ---
+        jobs = []
+        try:
+            for kind, conf in (("mcconf", mc_w), ("appconf", app_w)):
+                packet = self._encode_config_packet(kind, conf)
+                digest = self._packet_digest(packet)
+                if digest and digest == self.config_digests.get(kind):
+                    self._insert_log(f"{kind.upper()} unchanged, skipping write.")
+                    continue
+                jobs.append((kind, conf, packet, digest))
+        except Exception as e:
+            self._insert_log(f"Write Error: Encoding failed: {e}", error=True)
+            traceback.print_exc()
+            return tkinter.messagebox.showerror("Write Error", f"Encoding failed:\n{e}")
+        if not jobs:
+            return self._insert_log("No config changes, nothing written.")
+        names = " + ".join(kind.upper() for kind, *_ in jobs)
+        if not tkinter.messagebox.askyesno(
+            "Confirm Write", f"Overwrite VESC {names}?", icon="warning"
+        ):
+            return self._insert_log("Write cancelled.")
+        self._insert_log(f"Writing {names}...")
+        self.config_write_in_progress = True
+        self._update_config_button_states()
+        self.async_bridge.run(
+            self._write_configs(jobs),
+            lambda result: self._write_configs_finished(*result),
+        )
 
-    def _write_configs_worker(self, mc_conf, app_conf):
+    def _encode_config_packet(self, kind, conf):
+        """Encodes a SET_MCCONF/SET_APPCONF packet for conf."""
+        if kind == "mcconf":
+            msg = SetMcConf()
+            msg.mc_configuration = conf
+            (
+                conf.setdefault(
+                    "MCCONF_SIGNATURE",
+                    self.loaded_mc_config.get("MCCONF_SIGNATURE", 0),
+                )
+                if self.loaded_mc_config
+                else None
+            )
+            return encode_set_mcconf(msg)
+        msg = SetAppConf()
+        msg.app_configuration = conf
+        (
+            conf.setdefault(
+                "APPCONF_SIGNATURE",
+                self.loaded_app_config.get("APPCONF_SIGNATURE", 0),
+            )
+            if self.loaded_app_config
+            else None
+        )
+        return encode_set_appconf(msg)
+
+    def _packet_digest(self, packet):
+        """Hash of the serialized config inside an encoded packet."""
+        payload = read.packet_payload(packet)
+        return config_cache.payload_digest(payload[1:]) if payload else None
+
+    def _update_config_digests(self, mc, app, sources=None):
+        """Remembers the serialized form of the configs read from the device.
+
+        Configs loaded from the cache get no digest: the device may differ,
+        so their next write is never skipped.
+        """
+        self.config_digests = {}
+        try:
+            for kind, conf in (("mcconf", mc), ("appconf", app)):
+                if sources and sources.get(kind) != "device":
+                    continue
+                packet = self._encode_config_packet(kind, copy.deepcopy(conf))
+                self.config_digests[kind] = self._packet_digest(packet)
+        except Exception as e:
+            # 해시를 못 구하면 다음 쓰기는 항상 전체를 씀
+            print(f"Warn: Config digest failed: {e}")
+            self.config_digests = {}
+
+    async def _write_configs(self, jobs):
         ok, err = False, None
+        stages = {}  # 단계별 write -> ack 지연 시간 (seconds)
+        written = {}  # 쓰기에 성공한 설정의 payload 해시
         ser = self.serial_connection
 
-        # --- 추가: DataReader가 멈출 때까지 대기 ---
-        # print("Worker: Waiting for DataReader pause...")
-        paused = self.datareader_pause_event.wait(timeout=0.5)
-        if not paused:
-            err = "Timeout waiting for DataReader to pause before write."
-            print(f"Warning: {err}")
-        # --- 추가 끝 ---
-
-        if err is None:  # Pause 대기 성공 시에만 진행 (선택적)
-            if not ser or not ser.is_open:
-                err = "Connection lost before write."
-            else:
-                try:
-                    mc_msg = SetMcConf()
-                    mc_msg.mc_configuration = mc_conf
-                    (
-                        mc_msg.mc_configuration.setdefault(
-                            "MCCONF_SIGNATURE",
-                            self.loaded_mc_config.get("MCCONF_SIGNATURE", 0),
-                        )
-                        if self.loaded_mc_config
-                        else None
-                    )
-                    packet = encode_set_mcconf(mc_msg)
-                    read.clear_input_buffer(ser, 0.1)
-                    ser.write(packet)
-                    time.sleep(1.5)
-                    app_msg = SetAppConf()
-                    app_msg.app_configuration = app_conf
-                    (
-                        app_msg.app_configuration.setdefault(
-                            "APPCONF_SIGNATURE",
-                            self.loaded_app_config.get("APPCONF_SIGNATURE", 0),
-                        )
-                        if self.loaded_app_config
-                        else None
-                    )
-                    packet = encode_set_appconf(app_msg)
-                    read.clear_input_buffer(ser, 0.1)
-                    ser.write(packet)
-                    time.sleep(1.5)
-                    ok = True
-                except serial.SerialException as se:
-                    err = f"Serial Error writing:{se}"
-                    self.error_queue.put(err)
-                    print(err)
-                except Exception as e:
-                    err = f"Error writing:{e}"
-                    traceback.print_exc()
+        if not ser or not ser.is_open:
+            err = "Connection lost before write."
+        else:
+            try:
+                for kind, conf, packet, digest in jobs:
+                    name = kind.upper()
+                    stages[name] = await self.device_link.write_config(packet)
+                    if stages[name] is None:
+                        raise TimeoutError(f"No SET_{name} ack from VESC.")
+                    self._cache_written_config(kind, conf, packet)
+                    written[kind] = digest
+                ok = True
+            except serial.SerialException as se:
+                err = f"Serial Error writing:{se}"
+                self.error_queue.put(err)
+                print(err)
+            except TimeoutError as te:
+                err = str(te)
+                print(err)
+            except Exception as e:
+                err = f"Error writing:{e}"
+                traceback.print_exc()
 
-        # 작업 완료 또는 실패 시 메인 스레드 콜백 호출 및 Pause 해제
+        # 작업 완료 또는 실패: bridge 가 메인 스레드에서 _write_configs_finished 호출
         self.config_write_in_progress = False
-        self.pause_datareader = False
-        self.after(0, self._write_configs_finished, ok, err)
+        return ok, err, stages, written
+
+    def _cache_written_config(self, kind, conf, packet):
+        """Keeps the cache in step with what was just written to the device."""
+        if not self.device_key:
+            return
+        payload = read.packet_payload(packet)
+        if payload:
+            self.config_cache.store(self.device_key, kind, conf, payload[1:])
+        else:
+            self.config_cache.invalidate(self.device_key, kind)
 
     # --- Config Read/Write Workers 수정 끝 ---
 
-    def _write_configs_finished(self, success, error_msg):
+    def _write_configs_finished(self, success, error_msg, stages=None, written=None):
         self.config_write_in_progress = False
-        self.pause_datareader = False
         self._update_config_button_states()
+        # 장치에 반영된 설정은 다음 비교 기준이 됨 (부분 성공 포함)
+        self.config_digests.update(written or {})
+        if stages:
+            timing = ", ".join(
+                f"{name} {'timeout' if t is None else f'{t * 1000:.0f} ms'}"
+                for name, t in stages.items()
+            )
+            self._insert_log(f"Write timing: {timing}")
         if success:
             self._insert_log("Configs written.")
             tkinter.messagebox.showinfo("Write Success", "Configs written!")
@@ -1050,7 +2186,9 @@ class App(customtkinter.CTk):
         btn_w = getattr(self, "sidebar_button_write_all", None)
         btn_w.configure(state=write) if btn_w else None
 
-    def _update_ui_connection_state(self, connected=False, connecting=False):
+    def _update_ui_connection_state(
+        self, connected=False, connecting=False, disconnecting=False
+    ):
         txt, clr, con, dis, ref, com = (
             "",
             "",
@@ -1059,12 +2197,14 @@ class App(customtkinter.CTk):
             "disabled",
             "disabled",
         )
-        if connecting:
-            txt, clr = "Connecting...", "orange"
+        if connecting or disconnecting:
+            txt = "Connecting..." if connecting else "Disconnecting..."
+            clr = "orange"
             self.is_plotting = False
         elif connected:
             txt, clr = "Connected", ("#4CAF50", "#66BB6A")
-            dis, com, ref = "normal", "disabled", "disabled"
+            # 포트 메뉴는 추가 포트 선택을 위해 계속 활성화
+            dis, com, ref = "normal", "normal", "normal"
         else:
             txt = "Disconnected"
             dk, lt = "light coral", "#E57373"
@@ -1078,6 +2218,8 @@ class App(customtkinter.CTk):
             ref, com = "normal", "normal"
             self.is_plotting = False
             self.loaded_mc_config = self.loaded_app_config = None
+            self.device_key = None
+            self.config_digests = {}
             menu = getattr(self, "optionmenu_1", None)
             menu.set("(Connect First)") if menu else None
         lbl = getattr(self, "sidebar_is_connected", None)
@@ -1086,6 +2228,8 @@ class App(customtkinter.CTk):
         btn_con.configure(state=con) if btn_con else None
         btn_dis = getattr(self, "sidebar_button_disconnect", None)
         btn_dis.configure(state=dis) if btn_dis else None
+        btn_add = getattr(self, "sidebar_button_add_port", None)
+        btn_add.configure(state=dis) if btn_add else None
         btn_ref = getattr(self, "sidebar_button_refresh", None)
         btn_ref.configure(state=ref) if btn_ref else None
         mnu_com = getattr(self, "com_port_optionmenu", None)
@@ -1133,10 +2277,15 @@ class App(customtkinter.CTk):
         if not conn or mode != "RPM":
             self.rpm_var.set(0)
 
+    def _set_setpoint(self, mode, command):
+        # 슬라이더 이벤트마다 보내지 않고 CommandSender가 최신 값만 주기적으로 송신
+        if self.serial_connection and self.serial_connection.is_open:
+            self.command_sender.set_setpoint(mode, command)
+
     def _slider_duty_event(self, val):
         d = max(0.0, min(0.95, float(val) / 100.0))
         (
-            self._send_if_connected(SetDutyCycle(d))
+            self._set_setpoint("Duty", SetDutyCycle(d))
             if self.control_mode.get() == "Duty"
             else None
         )
@@ -1145,7 +2294,7 @@ class App(customtkinter.CTk):
     def _slider_current_event(self, val):
         c = round(float(val), 2)
         (
-            self._send_if_connected(SetCurrent(c))
+            self._set_setpoint("Current", SetCurrent(c))
             if self.control_mode.get() == "Current"
             else None
         )
@@ -1155,35 +2304,33 @@ class App(customtkinter.CTk):
         if self.control_mode.get() == "RPM":
             try:
                 rpm = int(self.rpm_var.get())
-                self._send_if_connected(SetRPM(rpm))
+                self._set_setpoint("RPM", SetRPM(rpm))
             except ValueError:
                 tkinter.messagebox.showerror("Input Error", "Invalid RPM.")
             except Exception as e:
                 tkinter.messagebox.showerror("RPM Error", f"{e}")
 
     def stop_button_event(self, log=True):
+        """Sends the emergency STOP burst to every open port via the writer
+        thread's fast path. Returns an Event set once it is written."""
+        # 추가 포트의 모터도 같은 burst로 정지 (각 포트의 reader 가 씀)
+        done = self.command_sender.emergency_stop(list(self.port_readers.values()))
         if log:
             self._insert_log("STOP pressed.")
-        sent = self._send_if_connected(SetCurrent(0))
-        self._send_if_connected(SetDutyCycle(0))
-        self._send_if_connected(SetRPM(0))
-        if sent:
+        if self.serial_connection and self.serial_connection.is_open:
             self.duty_var.set(0.0)
             self.current_var.set(0.0)
             self.rpm_var.set(0)
         elif log:
             self._insert_log("Cannot STOP: Not connected.", error=True)
+        return done
 
-    def _send_if_connected(self, cmd):
-        if self.serial_connection and self.serial_connection.is_open:
-            ok = read.send_command(self.serial_connection, cmd)
-            if not ok:
-                msg = f"Send Fail:{type(cmd).__name__}"
-                self._insert_log(msg, error=True)
-                self.error_queue.put(msg)
-                return False
-            return True
-        return False
+    def _show_stop_latency(self, latency, ports):
+        ms = latency * 1e3
+        lbl = getattr(self, "stop_latency_label", None)
+        lbl.configure(text=f"STOP: {ms:.2f} ms") if lbl else None
+        if ports:
+            self._insert_log(f"STOP written to {ports} port(s) in {ms:.2f} ms.")
 
     def print_fault_code(self, code):
         """Converts VESC fault code enum to a human-readable string."""
@@ -1220,19 +2367,13 @@ class App(customtkinter.CTk):
                     pass  # Ignore if widget destroyed during update
 
         if vals is None:  # Handle disconnection/no data
-            labels = [
-                "voltage",
-                "duty",
-                "mot_curr",
-                "batt_curr",
-                "erpm",
-                "temp_mos",
-                "power",
-                "fault",
-            ]
-            for name in labels:
-                upd(getattr(self, f"real_{name}_read", None), "N/A")
+            for labels in self.device_labels.values():
+                for widget in labels.values():
+                    upd(widget, "N/A")
             return
+        labels = self.device_labels.get(getattr(vals, "device", None))
+        if not labels:
+            return  # 패널이 없는 장치 (CAN 목록 변경 직후 등)
 
         # --- 수정된 try-except 블록 ---
         try:
@@ -1247,14 +2388,14 @@ class App(customtkinter.CTk):
             p = v * ic
 
             # Update each label on its own line
-            upd(self.real_voltage_read, f"{v:.2f} V")
-            upd(self.real_duty_read, f"{d:.1f} %")
-            upd(self.real_mot_curr_read, f"{mc:.2f} A")
-            upd(self.real_batt_curr_read, f"{ic:.2f} A")
-            upd(self.real_erpm_read, f"{erpm:.0f} ERPM")
-            upd(self.real_temp_mos_read, f"{t:.1f} °C")
-            upd(self.real_power_read, f"{p:.1f} W")
-            upd(self.real_fault_read, self.print_fault_code(f))
+            upd(labels["voltage"], f"{v:.2f} V")
+            upd(labels["duty"], f"{d:.1f} %")
+            upd(labels["mot_curr"], f"{mc:.2f} A")
+            upd(labels["batt_curr"], f"{ic:.2f} A")
+            upd(labels["erpm"], f"{erpm:.0f} ERPM")
+            upd(labels["temp_mos"], f"{t:.1f} °C")
+            upd(labels["power"], f"{p:.1f} W")
+            upd(labels["fault"], self.print_fault_code(f))
 
         except AttributeError as ae:
             # Handle cases where the VESC data object doesn't have an expected attribute
@@ -1286,14 +2427,21 @@ class App(customtkinter.CTk):
 
     def process_queue(self):
         try:
+            latest = {}  # device -> 가장 최근 샘플
             while not self.data_queue.empty():
                 values = self.data_queue.get_nowait()
-                (
-                    self.update_labels(values)
-                    if self.serial_connection and self.serial_connection.is_open
-                    else None
-                )
+                latest[getattr(values, "device", None)] = values
                 self._process_plot_data(values) if self.is_plotting else None
+            # 레이블은 샘플마다가 아니라 장치별 가장 최근 값으로 한 번만 갱신
+            if self.serial_connection and self.serial_connection.is_open:
+                for values in latest.values():
+                    self.update_labels(values)
+            ser = self.serial_connection
+            if getattr(ser, "finished", False) and not self._replay_end_logged:
+                self._replay_end_logged = True
+                self._insert_log("Replay finished.")
+            while not self.command_sender.stop_results.empty():
+                self._show_stop_latency(*self.command_sender.stop_results.get_nowait())
             while not self.error_queue.empty():
                 msg = self.error_queue.get_nowait()
                 err = any(
@@ -1308,145 +2456,331 @@ class App(customtkinter.CTk):
             traceback.print_exc()
         self.after(50, self.process_queue)
 
+    def _plot_capacity(self, device):
+        """Ring buffer length for a device: its share of the poll rate over
+        the longest plot window."""
+        if device in self.port_readers:
+            rate = self.port_readers[device].expected_sample_rate()
+        else:
+            reader = self.data_reader
+            rate = reader.expected_sample_rate() * reader.device_share(device)
+        return int(max(self.PLOT_WINDOWS) * rate) + 5
+
+    def _new_plot_series(self, device):
+        """Buffers for one device: the enabled channels in one RingBuffer,
+        plus a session MinMaxPyramid per enabled channel."""
+        keys = tuple(self.plot_channel_keys)
+        return {
+            "data": RingBuffer(self._plot_capacity(device), ("time",) + keys),
+            "channels": [plot_channels.BY_KEY[k] for k in keys],
+            "history": {},  # channel key -> MinMaxPyramid
+            "lines": {},  # channel key -> Line2D
+        }
+
     def _process_plot_data(self, vals):
         if not hasattr(vals, "timestamp"):
             return
         try:
             if self.plot_start_time is None:
                 self.plot_start_time = vals.timestamp
+            sr = self.plot_series.get(getattr(vals, "device", None))
+            if sr is None:
+                return  # 시리즈가 없는 장치 (CAN 목록 변경 직후 등)
             t = vals.timestamp - self.plot_start_time
-            d = getattr(vals, "duty_cycle_now", 0) * 100
-            c = getattr(vals, "avg_motor_current", 0)
-            self.time_data.append(t)
-            self.duty_data.append(d)
-            self.current_data.append(c)
+            values = [ch.value(vals) for ch in sr["channels"]]
+            sr["data"].append(t, *values)
+            hist = sr["history"]
+            for ch, value in zip(sr["channels"], values):
+                if ch.key in hist:
+                    hist[ch.key].append(t, value)
         except Exception as e:
             print(f"Plot data error:{e}")
 
+    def _plot_x_axis(self):
+        """Top axis; all group axes share its x-limits."""
+        return next(iter(self.plot_axes.values()))
+
+    def _plot_bins(self):
+        # 픽셀 column 당 최대 4점: 창 길이와 무관하게 그리는 점 수가 일정
+        return max(1, int(self._plot_x_axis().bbox.width))
+
     def _setup_plot_axes(self):
-        """Configures plot axes appearance."""
-        if not hasattr(self, "ax_duty") or not self.ax_duty:
+        """Applies theme colors, group labels and cached y-limits to the axes."""
+        if not self.plot_axes:
             return
         fg = plt.rcParams["text.color"]
         grid = plt.rcParams["grid.color"]
-        self.ax_duty.set_xlabel("Time (s)", color=fg)
-        self.ax_duty.set_ylabel("Duty (%)", color="tab:blue")
-        self.ax_duty.tick_params(axis="y", labelcolor="tab:blue")
-        self.ax_duty.tick_params(axis="x", colors=fg)
-        self.ax_duty.set_ylim(-5, 105)
-        self.ax_duty.grid(True, color=grid, ls="--", alpha=0.6)
-        self.ax_current.set_ylabel("Mot Curr (A)", color="tab:red")
-        self.ax_current.tick_params(axis="y", labelcolor="tab:red")
-        limit = getattr(self, "slider_current", None)
-        limit = limit.cget("to") if limit else 20
-        self.ax_current.set_ylim(-(limit + 5), limit + 5)
-        # Set spine colors (using a loop for brevity)
-        for sp, c in [
-            ("left", "tab:blue"),
-            ("right", "tab:red"),
-            ("bottom", fg),
-            ("top", fg),
-        ]:
-            # Check if ax_current exists for the 'right' spine adjustment
-            target_ax = self.ax_current if sp == "right" else self.ax_duty
-            if target_ax and hasattr(target_ax, "spines"):
-                try:
-                    target_ax.spines[sp].set_color(c)
-                except KeyError:
-                    pass  # Ignore if spine doesn't exist
-
-        # Make some spines invisible for clarity
-        self.ax_current.spines["left"].set_visible(False)
-        self.ax_current.spines["top"].set_visible(False)
-        self.ax_duty.spines["right"].set_visible(False)
-
-        # --- 수정된 라인 생성/할당 로직 ---
-        # Create or get the duty line
-        if self.plot_line_duty is None:
-            # plot returns a list containing the line, so take the first element
-            self.plot_line_duty = self.ax_duty.plot(
-                [], [], "b-", lw=1.5, label="Duty (%)"
-            )[0]
-        else:
-            # If line exists, ensure it's associated with the correct axes (e.g., after theme change)
-            if self.plot_line_duty not in self.ax_duty.lines:
-                self.ax_duty.add_line(self.plot_line_duty)
-
-        # Create or get the current line
-        if self.plot_line_current is None:
-            self.plot_line_current = self.ax_current.plot(
-                [], [], "r-", lw=1.5, alpha=0.8, label="Motor Curr (A)"
-            )[0]
-        else:
-            if self.plot_line_current not in self.ax_current.lines:
-                self.ax_current.add_line(self.plot_line_current)
-        # --- 수정 끝 ---
-
-        # Add legend (optional, might overlap)
-        # lines1, labels1 = self.ax_duty.get_legend_handles_labels()
-        # lines2, labels2 = self.ax_current.get_legend_handles_labels()
-        # self.ax_current.legend(lines1 + lines2, labels1 + labels2, loc='upper left', fontsize='small')
-
+        axes = list(self.plot_axes.items())
+        for i, (group, ax) in enumerate(axes):
+            label, default, _ = plot_channels.GROUPS[group]
+            ax.set_facecolor(plt.rcParams["axes.facecolor"])
+            ax.set_ylabel(label, color=fg)
+            ax.tick_params(colors=fg, labelbottom=i == len(axes) - 1)
+            ax.grid(True, color=grid, ls="--", alpha=0.6)
+            for sp in ax.spines.values():
+                sp.set_color(fg)
+            ax.set_ylim(*self._plot_ylim.get(group, default))
+        axes[-1][1].set_xlabel("Time (s)", color=fg)
         try:
             self.plot_figure.tight_layout()
         except Exception:
             pass  # Ignore errors if axes not ready
 
+    def _plot_artists(self):
+        """Artists redrawn every frame: all series lines."""
+        return [
+            line for sr in self.plot_series.values() for line in sr["lines"].values()
+        ]
+
+    def _rebuild_plot_series(self, devices):
+        """Adds/removes plot series for CAN devices and extra ports."""
+        for device in list(self.plot_series):
+            if device is not None and device not in devices:
+                del self.plot_series[device]
+        for device in devices:
+            if device not in self.plot_series:
+                self.plot_series[device] = self._new_plot_series(device)
+        self._rebuild_plot()
+
+    def _rebuild_plot(self):
+        """Re-creates one axis per enabled channel group and a line per
+        (device, channel), keeping the x-window and the session history."""
+        xlim = self._plot_x_axis().get_xlim() if self.plot_axes else None
+        fig = self.plot_figure
+        fig.clear()
+        self.plot_axes = {}
+        groups = plot_channels.channel_groups(self.plot_channel_keys)
+        first = None
+        for i, group in enumerate(groups):
+            ax = fig.add_subplot(len(groups), 1, i + 1, sharex=first)
+            ax.set_autoscale_on(False)  # x/y 범위는 직접 관리 (draw 때 autoscale 안 함)
+            first = first or ax
+            self.plot_axes[group] = ax
+        self._set_plot_xlim(*(xlim or (0, self.plot_time_window)))
+        first.callbacks.connect("xlim_changed", self._on_plot_xlim_changed)
+        # 채널은 색, 장치는 선 모양으로 구분
+        styles = ["-", "--", ":", "-."]
+        devices = sorted(
+            self.plot_series, key=lambda d: (d is not None, self._device_order(d))
+        )
+        for n, device in enumerate(devices):
+            sr = self.plot_series[device]
+            sr["lines"] = {}
+            for key in self.plot_channel_keys:
+                ch = plot_channels.BY_KEY[key]
+                label = ch.label
+                if device is not None:
+                    label = f"{self._device_name(device)} {ch.label}"
+                sr["lines"][key] = self.plot_axes[ch.group].plot(
+                    [], [], styles[n % len(styles)], color=ch.color, lw=1.5, label=label
+                )[0]
+            self._sync_plot_series(device, sr)
+        for ax in self.plot_axes.values():
+            # 한 축에 시리즈가 여럿이면 범례로 구분: 축 바깥에 두어 선과 겹치지 않으므로
+            # 정적 배경에 포함됨 (매 프레임 다시 그리지 않음)
+            if len(ax.get_lines()) > 1:
+                ax.legend(
+                    loc="upper left",
+                    bbox_to_anchor=(1.01, 1.0),
+                    fontsize="small",
+                    borderaxespad=0,
+                )
+        self._setup_plot_axes()  # 범례 크기에 맞춰 tight_layout
+        self.plot_blit.set_artists(self._plot_artists())
+        if not self._plot_follow:
+            self._draw_history()
+        self.plot_canvas.draw_idle()
+
+    def _sync_plot_series(self, device, sr):
+        """Matches a series' ring buffer to the enabled channels and the
+        device's share of the poll rate, and keeps one session pyramid per
+        enabled channel."""
+        keys = tuple(self.plot_channel_keys)
+        capacity = self._plot_capacity(device)
+        if sr["data"].fields[1:] != keys or sr["data"].capacity != capacity:
+            # 남은 채널의 최근 구간은 복사, 새로 켠 채널은 NaN (폴링하지 않던 필드)
+            sr["data"] = sr["data"].resized(capacity, ("time",) + keys)
+            sr["channels"] = [plot_channels.BY_KEY[k] for k in keys]
+        hist = sr["history"]
+        for key in list(hist):
+            if key not in self.plot_channel_keys:
+                del hist[key]
+        for key in self.plot_channel_keys:
+            if key not in hist:
+                # 새로 켠 채널: 그동안 저장하지 않았으므로 지금부터 history 시작
+                hist[key] = MinMaxPyramid((key,))
+
+    def _plot_channels_event(self):
+        win = getattr(self, "plot_channel_window", None)
+        if win and win.winfo_exists():
+            return win.focus()
+        win = customtkinter.CTkToplevel(self)
+        win.title("Plot Channels")
+        self.plot_channel_window = win
+        for row, (group, (label, _, _)) in enumerate(plot_channels.GROUPS.items()):
+            customtkinter.CTkLabel(win, text=label, anchor="w").grid(
+                row=row, column=0, padx=10, pady=(8, 0), sticky="w"
+            )
+            chans = [ch for ch in plot_channels.CHANNELS if ch.group == group]
+            for col, ch in enumerate(chans):
+                var = customtkinter.BooleanVar(value=ch.key in self.plot_channel_keys)
+                customtkinter.CTkCheckBox(
+                    win,
+                    text=ch.label,
+                    variable=var,
+                    command=lambda k=ch.key, v=var: self._toggle_plot_channel(k, v),
+                ).grid(row=row, column=col + 1, padx=5, pady=(8, 0), sticky="w")
+
+    def _toggle_plot_channel(self, key, var):
+        keys = set(self.plot_channel_keys)
+        keys.add(key) if var.get() else keys.discard(key)
+        if not keys:
+            var.set(True)  # 최소 한 채널은 표시
+            return
+        self.plot_channel_keys = [k for k in plot_channels.KEYS if k in keys]
+        self._update_telemetry_mask()
+        self._rebuild_plot()
+
     def _reset_plot(self):
         self.is_plotting = False
         self.plot_start_time = None
-        self.time_data.clear()
-        self.duty_data.clear()
-        self.current_data.clear()
-        if self.plot_line_duty:
-            self.plot_line_duty.set_data([], [])
-        if self.plot_line_current:
-            self.plot_line_current.set_data([], [])
-        for ax in [self.ax_duty, self.ax_current]:
-            if ax:
-                ax.relim()
-                ax.autoscale_view()
-        if self.ax_duty:
-            self.ax_duty.set_ylim(-5, 105)
-        if self.ax_current:
-            limit = getattr(self, "slider_current", None)
-            limit = limit.cget("to") if limit else 20
-            self.ax_current.set_ylim(-(limit + 5), limit + 5)
+        self._plot_xlim = None
+        self._plot_follow = True
+        self._plot_ylim = {}
+        for sr in self.plot_series.values():
+            sr["data"].clear()
+            for hist in sr["history"].values():
+                hist.clear()
+            for line in sr["lines"].values():
+                line.set_data([], [])
+        if self.plot_axes:
+            self._set_plot_xlim(0, self.plot_time_window)
+            self._setup_plot_axes()  # y 범위를 group 기본값으로
         if hasattr(self, "plot_canvas"):
             self.plot_canvas.draw_idle()
         self._update_plot_button_states()
 
     def _trigger_plot_update(self):
-        self._update_plot_visuals() if self.is_plotting else None
-        self.after(self.plot_update_interval, self._trigger_plot_update)
+        if self.is_plotting:
+            start = time.perf_counter()
+            self._update_plot_visuals()
+            self.plot_governor.frame(
+                time.perf_counter() - start, self.data_queue.qsize()
+            )
+            self._show_plot_stats()
+        self.after(self.plot_governor.interval_ms(), self._trigger_plot_update)
+
+    def _show_plot_stats(self):
+        now = time.monotonic()
+        if now - self._plot_stats_shown < 1.0:  # 레이블 갱신은 초당 한 번
+            return
+        self._plot_stats_shown = now
+        gov = self.plot_governor
+        self.plot_stats_label.configure(
+            text=f"{gov.fps():.1f} FPS | render {gov.render_time * 1e3:.1f} ms"
+            f" | every {gov.interval_ms()} ms"
+        )
 
     def _update_plot_visuals(self):
         if (
             not self.is_plotting
             or not hasattr(self, "plot_canvas")
-            or not self.time_data
+            or not any(len(sr["data"]) for sr in self.plot_series.values())
         ):
             return
         try:
-            t, d, c = (
-                list(self.time_data),
-                list(self.duty_data),
-                list(self.current_data),
-            )
-            self.plot_line_duty.set_data(t, d)
-            self.plot_line_current.set_data(t, c)
-            t_min = max(0, t[-1] - self.plot_time_window) if t else 0
-            t_max = t[-1] if t else 1
-            t_max = (
-                t_min + self.plot_time_window
-                if t_max - t_min < self.plot_time_window * 0.9
-                else t_max
-            )
-            self.ax_duty.set_xlim(t_min, t_max + 1)
-            self.plot_canvas.draw_idle()
+            if not self._plot_follow:
+                self._draw_history()  # 확대/이동한 구간 유지, 새 샘플만 반영
+                self.plot_blit.update()
+                return
+            # 정렬된 연속 view: 리스트 변환/할당 없음
+            series = [(sr, sr["data"].view("time")) for sr in self.plot_series.values()]
+            t_last = max((t[-1] for _, t in series if len(t)), default=0)
+            if self._update_plot_xlim(t_last):
+                self.plot_blit.invalidate()  # 눈금이 바뀌므로 전체 redraw
+            x_min, x_max = self._plot_xlim
+            bins = self._plot_bins()
+            ranges = {}  # group -> 화면에 보이는 데이터의 (min, max)
+            for sr, t in series:
+                i0 = max(0, int(t.searchsorted(x_min)) - 1)  # 왼쪽 끝까지 이어지게
+                for key, line in sr["lines"].items():
+                    y = sr["data"].view(key)[i0:]
+                    td, yd = minmax_decimate(t[i0:], y, x_min, x_max, bins)
+                    line.set_data(td, yd)
+                    r = value_range(yd)
+                    group = plot_channels.BY_KEY[key].group
+                    if r and group in ranges:
+                        r = min(r[0], ranges[group][0]), max(r[1], ranges[group][1])
+                    ranges[group] = r or ranges.get(group)
+            if self._autoscale_plot_y(ranges):
+                self.plot_blit.invalidate()  # y 눈금이 바뀜
+            self.plot_blit.update()
         except Exception as e:
             print(f"Plot update error:{e}")
 
+    def _autoscale_plot_y(self, ranges):
+        """Updates cached y-limits (with hysteresis). Returns True if any
+        axis changed."""
+        changed = False
+        for group, r in ranges.items():
+            ax = self.plot_axes.get(group)
+            if not r or not ax:
+                continue
+            new = plot_channels.autoscale_limits(
+                self._plot_ylim.get(group), r[0], r[1], plot_channels.GROUPS[group][2]
+            )
+            if new:
+                self._plot_ylim[group] = new
+                ax.set_ylim(*new)
+                changed = True
+        return changed
+
+    def _plot_window_event(self, choice):
+        self.plot_time_window = int(choice.split()[0])
+        self._plot_follow_live()
+
+    def _plot_follow_live(self):
+        self._plot_follow = True
+        self._plot_xlim = None  # 다음 갱신에서 x 구간 재계산 + 전체 redraw
+        self._update_plot_visuals()
+
+    def _on_plot_xlim_changed(self, ax):
+        """Toolbar zoom/pan: stop following live data and redraw the lines
+        for the new limits from the session history."""
+        if self._setting_xlim:
+            return
+        self._plot_follow = False
+        try:
+            self._draw_history()  # 이어지는 툴바 redraw 에 반영됨
+        except Exception as e:
+            print(f"Plot history error:{e}")
+
+    def _draw_history(self):
+        """Sets every line from its MinMaxPyramid for the current x-limits."""
+        x_min, x_max = self._plot_x_axis().get_xlim()
+        bins = self._plot_bins()
+        for sr in self.plot_series.values():
+            for key, line in sr["lines"].items():
+                line.set_data(*sr["history"][key].query(key, x_min, x_max, bins))
+
+    def _set_plot_xlim(self, x_min, x_max):
+        self._setting_xlim = True  # 코드에서 바꾸는 범위는 사용자 확대/이동이 아님
+        try:
+            self._plot_x_axis().set_xlim(x_min, x_max)
+        finally:
+            self._setting_xlim = False
+
+    def _update_plot_xlim(self, t_last):
+        """Moves the x-window forward in steps once the newest sample passes
+        its right edge. Returns True if the limits changed."""
+        if self._plot_xlim is not None and t_last <= self._plot_xlim[1]:
+            return False
+        win = self.plot_time_window
+        t_max = max(win, t_last + win * self.plot_window_jump)
+        self._plot_xlim = (t_max - win, t_max)
+        self._set_plot_xlim(*self._plot_xlim)
+        return True
+
     def _update_plot_theme_params(self):
         mode = customtkinter.get_appearance_mode()
         style = "seaborn-v0_8-darkgrid" if mode == "Dark" else "seaborn-v0_8-whitegrid"
@@ -1474,17 +2808,17 @@ class App(customtkinter.CTk):
         plt.rcParams.update(dk if mode == "Dark" else lt)
         if hasattr(self, "plot_figure"):
             self.plot_figure.set_facecolor(plt.rcParams["figure.facecolor"])
-        if hasattr(self, "ax_duty"):
-            self.ax_duty.set_facecolor(plt.rcParams["axes.facecolor"])
-            self.ax_duty.grid(
-                True, color=plt.rcParams["grid.color"], ls="--", alpha=0.6
-            )
-            self.ax_duty.tick_params(axis="x", colors=plt.rcParams["xtick.color"])
+        for ax in getattr(self, "plot_axes", {}).values():
+            ax.set_facecolor(plt.rcParams["axes.facecolor"])
+            ax.grid(True, color=plt.rcParams["grid.color"], ls="--", alpha=0.6)
+            ax.tick_params(axis="x", colors=plt.rcParams["xtick.color"])
 
     def _update_plot_theme(self):
         self._update_plot_theme_params()
         if hasattr(self, "plot_figure"):
             self._setup_plot_axes()
+            self.plot_blit.invalidate()  # 배경 색/격자가 바뀜
+            self.plot_canvas.draw_idle()
             self._update_plot_visuals()
         tb = getattr(self, "plot_toolbar", None)
         if tb:
@@ -1507,6 +2841,7 @@ class App(customtkinter.CTk):
             return
         self._insert_log("Starting plot...")
         self._reset_plot()
+        self.plot_governor.reset()
         self.is_plotting = True
         self.plot_start_time = None
         self._update_plot_button_states()
@@ -1532,21 +2867,22 @@ class App(customtkinter.CTk):
         self._insert_log("Closing application...")
         self._stop_plotting_event()
 
-        if self.data_reader and self.data_reader.is_alive():
-            self._insert_log("Stopping DataReader thread...")
-            self.data_reader.stop()
-            # --- 추가 대기 시간 증가 ---
-            time.sleep(
-                0.3
-            )  # Give reader more time to see self.running flag and exit loop
-
+        # STOP 은 DataReader 가 송신하므로 reader 를 멈추기 전에 연결 해제
         if self.serial_connection and self.serial_connection.is_open:
-            self._handle_disconnection(log=True)
+            self._handle_disconnection(log=True, block=True)
+        elif self._pending_disconnect:
+            # 연결 해제가 STOP 송신을 기다리는 중: 여기서 기다리고 바로 마무리
+            self._pending_disconnect[2].wait(2 * STOP_WRITE_TIMEOUT)
+            self._finish_disconnection(self._pending_disconnect)
         else:
             if self.serial_connection:
                 read.close_serial_port(self.serial_connection)
+        self.command_sender.stop()  # 연결 해제 시 STOP 송신 이후에 종료
+        self.async_bridge.close()  # 남은 설정 트랜잭션 취소 (포트는 이미 해제)
 
         if self.data_reader and self.data_reader.is_alive():
+            self._insert_log("Stopping DataReader thread...")
+            self.data_reader.stop()
             self._insert_log("Waiting for DataReader thread to join...")
             self.data_reader.join(timeout=1.0)  # Increase timeout slightly
             if self.data_reader.is_alive():
@@ -0,0 +1,233 @@
+import numpy as np
+
+# --- 플롯용 NumPy ring buffer ---
+# field 마다 한 행인 struct-of-arrays. 각 샘플을 [i] 와 [i + capacity] 두 곳에 써서
+# (mirrored ring) 시간 순서대로 정렬된 최근 구간이 항상 연속된 slice 가 됨:
+# view() 는 복사 없이 ndarray view 를 반환하고 append 비용은 창 길이와 무관함.
+
+
+class RingBuffer:
+    """Fixed-capacity ring of float samples with ordered zero-copy views."""
+
+    def __init__(self, capacity, fields, dtype=np.float64):
+        self.capacity = max(1, int(capacity))
+        self.fields = tuple(fields)
+        self._row = {name: i for i, name in enumerate(self.fields)}
+        self._data = np.zeros((len(self.fields), 2 * self.capacity), dtype=dtype)
+        self._pos = 0  # 다음에 쓸 위치 (0 <= pos < capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, *values):
+        """Appends one sample, one value per field in field order."""
+        i = self._pos
+        col = self._data[:, i]
+        col[:] = values
+        self._data[:, i + self.capacity] = col
+        self._pos = i + 1 if i + 1 < self.capacity else 0
+        if self._size < self.capacity:
+            self._size += 1
+
+    def clear(self):
+        self._pos = 0
+        self._size = 0
+
+    def _window(self):
+        end = self._pos + self.capacity
+        return slice(end - self._size, end)
+
+    def view(self, field):
+        """Ordered (oldest first) read-only view of one field.
+
+        The view is only valid until the next append; copy it to keep it.
+        """
+        v = self._data[self._row[field], self._window()]
+        v.flags.writeable = False
+        return v
+
+    def resized(self, capacity, fields):
+        """New ring with the given capacity and fields holding the most
+        recent samples; fields this ring does not have start as NaN."""
+        out = RingBuffer(capacity, fields, self._data.dtype)
+        n = min(self._size, out.capacity)
+        if n:
+            end = self._pos + self.capacity
+            rows = np.full((len(out.fields), n), np.nan, dtype=out._data.dtype)
+            for i, name in enumerate(out.fields):
+                if name in self._row:
+                    rows[i] = self._data[self._row[name], end - n : end]
+            out._data[:, :n] = rows
+            out._data[:, out.capacity : out.capacity + n] = rows
+            out._pos = n % out.capacity
+            out._size = n
+        return out
+
+
+def minmax_decimate(t, y, t0, t1, bins):
+    """Reduces sorted (t, y) over [t0, t1] to at most 4 points per bin
+    (first, min, max, last, in time order).
+
+    With one bin per pixel column the line looks the same as the full
+    data, spikes included, while the point count is bounded by the
+    canvas width. Inputs small enough are returned unchanged; NaN
+    samples (missing fields) are dropped before reducing.
+    """
+    n = len(t)
+    if n > 4 * bins:
+        valid = ~np.isnan(y)
+        if not valid.all():
+            t, y = t[valid], y[valid]
+            n = len(t)
+    bins = int(bins)
+    if n <= 4 * bins or bins < 1 or t1 <= t0:
+        return t, y
+    col = ((t - t0) * (bins / (t1 - t0))).astype(np.int64)
+    np.clip(col, 0, bins - 1, out=col)
+    # t 가 정렬되어 있으므로 같은 column 의 샘플은 연속된 구간을 이룸
+    starts = np.flatnonzero(np.diff(col, prepend=-1))
+    counts = np.diff(starts, append=n)
+    ends = starts + counts - 1
+    lo = np.minimum.reduceat(y, starts)
+    hi = np.maximum.reduceat(y, starts)
+    # 구간 최솟값/최댓값이 처음 나오는 위치 (O(n), 정렬 없음)
+    pos_lo = np.flatnonzero(y == np.repeat(lo, counts))
+    pos_hi = np.flatnonzero(y == np.repeat(hi, counts))
+    i_lo = pos_lo[np.searchsorted(pos_lo, starts)]
+    i_hi = pos_hi[np.searchsorted(pos_hi, starts)]
+    idx = np.sort(np.column_stack((starts, i_lo, i_hi, ends)), axis=1).ravel()
+    return t[idx], y[idx]
+
+
+# --- 전체 세션 min/max pyramid (history zoom/pan 용) ---
+# level 0 = 원본 샘플, level k = factor**k 개 샘플 block 마다
+# (시작 시각, 끝 시각, 채널별 최솟값/최댓값과 그 시각).
+# 샘플이 들어올 때 block 이 찰 때마다 위 level 로 누적 생성함.
+PYRAMID_FACTOR = 8
+
+
+class _Growable:
+    """Append-only 2D float array (one row per field), grown by doubling."""
+
+    def __init__(self, rows, capacity=1024):
+        self._data = np.empty((rows, capacity))
+        self.size = 0
+
+    def append(self, values):
+        if self.size == self._data.shape[1]:
+            grown = np.empty((self._data.shape[0], 2 * self.size))
+            grown[:, : self.size] = self._data
+            self._data = grown
+        self._data[:, self.size] = values
+        self.size += 1
+
+    def rows(self, start=0, stop=None):
+        stop = self.size if stop is None else stop
+        return self._data[:, start:stop]
+
+    def clear(self):
+        self.size = 0
+
+
+class MinMaxPyramid:
+    """Multi-resolution min/max history of one device's plot channels.
+
+    query() picks the coarsest level that still has a block per pixel
+    column for the requested time range, so rendering any span of a
+    multi-hour session costs about the same.
+    """
+
+    def __init__(self, channels, factor=PYRAMID_FACTOR):
+        self.channels = tuple(channels)
+        self.factor = factor
+        self._levels = [_Growable(1 + len(self.channels))]  # time + 채널 값
+
+    def __len__(self):
+        return self._levels[0].size
+
+    def clear(self):
+        self._levels = self._levels[:1]
+        self._levels[0].clear()
+
+    def append(self, t, *values):
+        self._levels[0].append((t,) + values)
+        k = 0
+        while self._levels[k].size % self.factor == 0:
+            block = self._reduce(k)
+            if k + 1 == len(self._levels):
+                self._levels.append(_Growable(len(block)))
+            self._levels[k + 1].append(block)
+            k += 1
+
+    def _reduce(self, k):
+        """Summarises the last factor entries of level k into one block."""
+        n = self._levels[k].size
+        rows = self._levels[k].rows(n - self.factor, n)
+        nc = len(self.channels)
+        if k == 0:
+            start, end = rows[0, 0], rows[0, -1]
+            t_lo = t_hi = np.broadcast_to(rows[0], (nc, self.factor))
+            lo = hi = rows[1:]
+        else:
+            start, end = rows[0, 0], rows[1, -1]
+            t_lo, lo, t_hi, hi = rows[2:].reshape(nc, 4, self.factor).transpose(1, 0, 2)
+        # NaN(필드 없음)은 극값 후보에서 제외; 전부 NaN 이면 결과도 NaN
+        i_lo = np.where(np.isnan(lo), np.inf, lo).argmin(axis=1)
+        i_hi = np.where(np.isnan(hi), -np.inf, hi).argmax(axis=1)
+        ch = np.arange(nc)
+        block = np.empty((nc, 4))
+        block[:, 0] = t_lo[ch, i_lo]
+        block[:, 1] = lo[ch, i_lo]
+        block[:, 2] = t_hi[ch, i_hi]
+        block[:, 3] = hi[ch, i_hi]
+        return np.concatenate(([start, end], block.ravel()))
+
+    def query(self, channel, t0, t1, bins):
+        """(t, y) of channel over [t0, t1], at most 4 points per bin."""
+        c = self.channels.index(channel)
+        raw = self._levels[0].rows()
+        t = raw[0]
+        i0 = max(0, int(t.searchsorted(t0)) - 1)
+        i1 = min(len(t), int(t.searchsorted(t1, "right")) + 1)
+        bins = max(1, int(bins))
+        k = 0
+        while k + 1 < len(self._levels) and i1 - i0 >= bins * self.factor ** (k + 1):
+            k += 1
+        parts_t, parts_y = [], []
+        cursor = i0  # 원본 샘플 index 기준으로 아직 내보내지 않은 위치
+        for j in range(k, 0, -1):
+            size = self.factor**j
+            level = self._levels[j]
+            b0, b1 = cursor // size, min(level.size, -(-i1 // size))
+            if b1 <= b0:
+                continue
+            rows = level.rows(b0, b1)
+            t_lo, lo, t_hi, hi = rows[2 + 4 * c : 6 + 4 * c]
+            first = t_lo <= t_hi  # block 안에서 먼저 나온 극값을 먼저
+            parts_t.append(
+                np.column_stack(
+                    (np.where(first, t_lo, t_hi), np.where(first, t_hi, t_lo))
+                ).ravel()
+            )
+            parts_y.append(
+                np.column_stack(
+                    (np.where(first, lo, hi), np.where(first, hi, lo))
+                ).ravel()
+            )
+            cursor = b1 * size
+        if cursor < i1:
+            parts_t.append(t[cursor:i1])
+            parts_y.append(raw[1 + c, cursor:i1])
+        if not parts_t:
+            return t[:0], t[:0]
+        ts, ys = np.concatenate(parts_t), np.concatenate(parts_y)
+        return minmax_decimate(ts, ys, t0, t1, bins)
+
+
+def value_range(y):
+    """(min, max) of the non-NaN values in y, or None if there are none."""
+    y = y[~np.isnan(y)]
+    if not len(y):
+        return None
+    return float(y.min()), float(y.max())
@@ -0,0 +1,128 @@
+import math
+
+# --- 플롯 채널 registry ---
+# 채널 하나 = GetValues 필드에서 계산한 플롯 시리즈 하나.
+# 같은 group 의 채널은 같은 y 축을 공유하고, 켜진 group 마다 축이 하나씩 세로로 쌓임.
+
+# group -> (y 축 라벨, 기본 y 범위, 최소 y 범위 폭)
+GROUPS = {
+    "duty": ("Duty (%)", (-5.0, 105.0), 10.0),
+    "current": ("Current (A)", (-25.0, 25.0), 2.0),
+    "speed": ("Speed (ERPM)", (-1000.0, 1000.0), 500.0),
+    "voltage": ("Voltage (V)", (0.0, 60.0), 2.0),
+    "temp": ("Temp (°C)", (0.0, 100.0), 5.0),
+    "power": ("Power (W)", (-500.0, 500.0), 50.0),
+    "energy": ("Energy (Ah, Wh)", (0.0, 1.0), 0.1),
+    "position": ("Position", (-1.0, 1.0), 1.0),
+}
+
+# autoscale hysteresis: 데이터가 범위를 벗어나면 YLIM_PAD 만큼 여유를 두고 확장,
+# 데이터 폭이 현재 범위의 YLIM_SHRINK 미만으로 줄었을 때만 축소
+YLIM_PAD = 0.1
+YLIM_SHRINK = 0.4
+
+
+class PlotChannel:
+    """One plottable telemetry series computed from a GetValues sample."""
+
+    def __init__(self, key, label, group, color, fields, scale=1.0, compute=None):
+        self.key = key
+        self.label = label
+        self.group = group
+        self.color = color
+        self.fields = fields  # selective 요청에 필요한 GetValues 필드
+        self.scale = scale
+        self.compute = compute
+
+    def value(self, vals):
+        """Channel value for a sample, NaN if a field is missing."""
+        try:
+            if self.compute:
+                return float(self.compute(vals))
+            return float(getattr(vals, self.fields[0])) * self.scale
+        except (AttributeError, TypeError, ValueError):
+            return math.nan
+
+
+def _power(vals):
+    return vals.v_in * vals.avg_input_current
+
+
+CHANNELS = (
+    PlotChannel("duty", "Duty", "duty", "tab:blue", ("duty_cycle_now",), 100.0),
+    PlotChannel(
+        "motor_current", "Motor Curr", "current", "tab:red", ("avg_motor_current",)
+    ),
+    PlotChannel(
+        "input_current", "Input Curr", "current", "tab:orange", ("avg_input_current",)
+    ),
+    PlotChannel("id", "Id", "current", "tab:pink", ("avg_id",)),
+    PlotChannel("iq", "Iq", "current", "tab:brown", ("avg_iq",)),
+    PlotChannel("erpm", "ERPM", "speed", "tab:green", ("rpm",)),
+    PlotChannel("v_in", "V In", "voltage", "tab:purple", ("v_in",)),
+    PlotChannel("vd", "Vd", "voltage", "tab:olive", ("vd",)),
+    PlotChannel("vq", "Vq", "voltage", "tab:cyan", ("vq",)),
+    PlotChannel("temp_fet", "MOS Temp", "temp", "tab:red", ("temp_fet",)),
+    PlotChannel("temp_motor", "Motor Temp", "temp", "tab:blue", ("temp_motor",)),
+    PlotChannel("temp_mos1", "MOS1 Temp", "temp", "tab:orange", ("temp_mos1",)),
+    PlotChannel("temp_mos2", "MOS2 Temp", "temp", "tab:green", ("temp_mos2",)),
+    PlotChannel("temp_mos3", "MOS3 Temp", "temp", "tab:purple", ("temp_mos3",)),
+    PlotChannel(
+        "power",
+        "Power",
+        "power",
+        "tab:orange",
+        ("v_in", "avg_input_current"),
+        compute=_power,
+    ),
+    PlotChannel("amp_hours", "Ah", "energy", "tab:blue", ("amp_hours",)),
+    PlotChannel(
+        "amp_hours_charged", "Ah Chg", "energy", "tab:cyan", ("amp_hours_charged",)
+    ),
+    PlotChannel("watt_hours", "Wh", "energy", "tab:red", ("watt_hours",)),
+    PlotChannel(
+        "watt_hours_charged", "Wh Chg", "energy", "tab:orange", ("watt_hours_charged",)
+    ),
+    PlotChannel("tachometer", "Tacho", "position", "tab:green", ("tachometer",)),
+    PlotChannel(
+        "tachometer_abs", "Tacho Abs", "position", "tab:olive", ("tachometer_abs",)
+    ),
+    PlotChannel("pid_pos", "PID Pos", "position", "tab:purple", ("pid_pos_now",)),
+)
+BY_KEY = {ch.key: ch for ch in CHANNELS}
+KEYS = tuple(ch.key for ch in CHANNELS)
+DEFAULT_CHANNELS = ("duty", "motor_current")
+
+
+def channel_fields(keys):
+    """GetValues fields needed to plot the given channels."""
+    return {f for k in keys for f in BY_KEY[k].fields}
+
+
+def channel_groups(keys):
+    """Groups of the given channels, in registry order (one axis each)."""
+    groups = []
+    for ch in CHANNELS:
+        if ch.key in keys and ch.group not in groups:
+            groups.append(ch.group)
+    return groups
+
+
+def autoscale_limits(current, lo, hi, min_span):
+    """New (low, high) y-limits for data in [lo, hi], or None to keep current.
+
+    Limits grow with some headroom as soon as data leaves them, but only
+    shrink once the data uses less than YLIM_SHRINK of the range, so they
+    do not follow every wiggle.
+    """
+    if not (math.isfinite(lo) and math.isfinite(hi)):
+        return None
+    span = max(hi - lo, min_span)
+    if current is not None:
+        c_lo, c_hi = current
+        inside = c_lo <= lo and hi <= c_hi
+        if inside and span >= YLIM_SHRINK * (c_hi - c_lo):
+            return None
+    mid = (lo + hi) / 2
+    half = span / 2 * (1 + 2 * YLIM_PAD)
+    return mid - half, mid + half
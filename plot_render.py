@@ -0,0 +1,120 @@
+import time
+from collections import deque
+
+# --- 플롯 blitting ---
+# 축, 격자, 눈금, 텍스트 같은 정적인 부분은 전체 redraw 때 한 번 그려 배경으로 저장하고,
+# 매 프레임에는 배경을 복원한 뒤 line artist 만 다시 그려 canvas 에 blit 함.
+# 전체 redraw 는 x 구간 이동, 테마 변경, 창 크기 변경, 시리즈 추가/삭제 때만 발생.
+
+
+class BlitManager:
+    """Redraws only the registered (animated) artists over a cached background."""
+
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self._background = None
+        self._artists = []
+        self.full_draws = 0
+        self.blits = 0
+        self.set_artists(artists)
+        # 전체 redraw (리사이즈, 툴바 등 외부 요인 포함) 마다 배경을 다시 저장
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_artists(self, artists):
+        """Replaces the set of artists redrawn on every frame."""
+        for a in self._artists:
+            a.set_animated(False)
+        self._artists = [a for a in artists if a is not None]
+        for a in self._artists:
+            a.set_animated(True)  # 일반 draw 에서 제외 -> 배경에 남지 않음
+        self.invalidate()
+
+    def invalidate(self):
+        """Forces a full redraw on the next update (axes limits/theme changed)."""
+        self._background = None
+
+    def _on_draw(self, event):
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.full_draws += 1
+        self._draw_artists()
+
+    def _draw_artists(self):
+        fig = self.canvas.figure
+        for a in self._artists:
+            if a.figure is fig:  # 제거된 artist 는 건너뜀
+                fig.draw_artist(a)
+
+    def update(self):
+        """Draws the current artist state: a blit if the background is valid,
+        otherwise a full redraw (which re-caches the background)."""
+        if self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.blits += 1
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self._cid)
+
+
+# --- 적응형 플롯 갱신 주기 ---
+# 프레임 렌더링 시간(EWMA)을 CPU 예산으로 나눈 값을 다음 갱신 주기로 사용:
+# 렌더링이 느리면 주기를 늘리고 (즉시), 여유가 생기면 점진적으로 줄임.
+# GUI 큐가 밀리면 (Tk 루프가 샘플 처리를 못 따라감) 추가로 backoff.
+PLOT_CPU_BUDGET = 0.2  # Tk 스레드 시간 중 플롯 렌더링에 쓸 비율
+PLOT_MIN_INTERVAL = 1 / 30  # 최대 30 FPS
+PLOT_MAX_INTERVAL = 1.0
+PLOT_BACKLOG_LIMIT = 200  # 렌더링 시점에 남은 GUI 큐 샘플 수 상한
+
+
+class RefreshGovernor:
+    """Chooses the plot refresh interval from measured render times."""
+
+    def __init__(
+        self,
+        budget=PLOT_CPU_BUDGET,
+        min_interval=PLOT_MIN_INTERVAL,
+        max_interval=PLOT_MAX_INTERVAL,
+        initial=0.1,
+        alpha=0.2,
+    ):
+        self.budget = budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = initial
+        self.alpha = alpha
+        self.render_time = None  # 렌더링 시간 EWMA (seconds)
+        self.backoffs = 0
+        self._frames = deque(maxlen=20)  # 최근 프레임 시작 시각 (FPS 계산용)
+
+    def frame(self, render_time, backlog=0, now=None):
+        """Records one rendered frame and updates the interval."""
+        self._frames.append(time.monotonic() if now is None else now)
+        if self.render_time is None:
+            self.render_time = render_time
+        else:
+            self.render_time += self.alpha * (render_time - self.render_time)
+        target = self.render_time / self.budget
+        if backlog > PLOT_BACKLOG_LIMIT:
+            target = max(target, self.interval * 2)
+            self.backoffs += 1
+        if target < self.interval:
+            target = max(target, self.interval * 0.8)  # 빨라질 때는 천천히
+        self.interval = min(self.max_interval, max(self.min_interval, target))
+
+    def interval_ms(self):
+        return max(1, int(self.interval * 1000))
+
+    def fps(self):
+        """Measured frames per second over the recent frames."""
+        if len(self._frames) < 2:
+            return 0.0
+        span = self._frames[-1] - self._frames[0]
+        return (len(self._frames) - 1) / span if span > 0 else 0.0
+
+    def reset(self):
+        self._frames.clear()
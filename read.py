@@ -3,44 +3,398 @@ import time
 import serial
 import struct
 import pprint
+import traceback
 
 # !!! 필요한 모듈/클래스/함수 import 확인 및 수정 !!!
 try:
-    from pyvesc.VESC.messages import GetValues
+    from pyvesc.VESC.messages import GetValues, SetCurrent, SetDutyCycle, SetRPM
     from pyvesc.VESC.messages.getters import GetMcConfRequest, GetAppConfRequest
     from pyvesc.VESC.messages.vesc_protocol_utils import (
         parse_mc_conf_serialized,
         parse_app_conf_serialized,
     )
     from pyvesc.protocol.interface import encode_request, encode
-    from pyvesc.protocol.packet.codec import unframe
-    from pyvesc import decode
+    from pyvesc.protocol.packet.codec import unframe, frame
+    from pyvesc.protocol.base import VESCMessage
 
 except ImportError as e:
     print(f"오류(read.py): 필요한 pyvesc 컴포넌트 import 실패 ({e}).")
     raise
 
 # --- 타임아웃 값 조정 ---
-TIMEOUT = 0.05  # DataReader sleep time
+TIMEOUT = 0.05  # 기본 폴링 주기 (SAMPLE_RATE 미지정 시 플롯 버퍼 크기 산정용)
+SAMPLE_RATE = 50  # DataReader 목표 샘플링 속도 (Hz), 0/None = 링크 속도로 자유 폴링
+# 제어 setpoint 송신 주기 (Hz): 펌웨어 timeout(기본 1000 ms)보다 충분히 짧게 유지
+COMMAND_RATE = 20
 # 설정 읽기 타임아웃을 약간 더 늘림 (VESC 응답 시간 고려)
 CONFIG_READ_TIMEOUT = 2.5  # seconds
+CONFIG_WRITE_TIMEOUT = 5.0  # 설정 쓰기 ack 대기 (플래시 저장 시간 포함, seconds)
+
+
+# --- 스트리밍 프레임 디코더 ---
+# VESC 프레임: [0x02][len:1] 또는 [0x03][len:2] + payload + [crc:2] + [0x03]
+FRAME_START_SHORT = 0x02
+FRAME_START_LONG = 0x03
+FRAME_STOP = 0x03
+RX_BUFFER_SIZE = 16384  # 연결당 수신 버퍼 최대 크기 (bytes)
+MAX_PAYLOAD_LEN = 4096  # 펌웨어 패킷 버퍼 크기: 이보다 긴 길이 헤더는 잡음으로 간주
+REALTIME_READ_TIMEOUT = 0.1  # 응답 프레임 하나를 기다리는 최대 시간 (seconds)
+# 수신 대기 read 의 고정 ser.timeout: 바꾸지 않고 deadline 까지 반복해서 읽음
+# (데이터가 오면 바로 반환되므로 idle 상태에서만 이 주기로 깨어남)
+READ_POLL_TIMEOUT = 0.005
+# --- 파이프라인 폴링 ---
+PIPELINE_DEPTH = 4  # 동시에 응답을 기다리는 GetValues 요청 수 (1 = stop-and-wait)
+PIPELINE_RESPONSE_TIMEOUT = 0.3  # 이 시간 안에 응답이 없으면 요청이 유실된 것으로 간주
+PIPELINE_MAX_SAMPLE_RATE = 200  # 플롯 버퍼 크기 산정용 예상 최대 샘플 속도 (Hz)
+
+
+class FrameDecoder:
+    """Incremental VESC frame decoder.
+
+    Bytes are fed as they arrive; partial frames are kept until the rest of
+    the frame shows up, and every complete frame in the buffer is yielded.
+    Consumed bytes are tracked with a read offset and only compacted once
+    they make up half of the buffer, so decoding stays O(n) even for
+    multi-kilobyte config frames or long runs of garbage.
+    """
+
+    def __init__(self, max_size=RX_BUFFER_SIZE):
+        self.max_size = max_size
+        self._buf = bytearray()
+        self._pos = 0  # 아직 처리하지 않은 첫 바이트 위치
+        self.frames_decoded = 0
+        self.bytes_dropped = 0
+
+    def reset(self):
+        self._buf.clear()
+        self._pos = 0
+
+    def __len__(self):
+        return len(self._buf) - self._pos
+
+    def _compact(self):
+        if self._pos:
+            del self._buf[: self._pos]
+            self._pos = 0
+
+    def feed(self, data):
+        if not data:
+            return
+        if self._pos and self._pos * 2 >= len(self._buf):
+            self._compact()
+        self._buf += data
+        overflow = len(self) - self.max_size
+        if overflow > 0:
+            # 링 버퍼처럼 가장 오래된 바이트를 버림
+            self._pos += overflow
+            self.bytes_dropped += overflow
+
+    def _resync(self):
+        """Skips to the next possible start byte (one find() per start byte
+        instead of dropping one byte at a time)."""
+        new_pos = self._next_start(self._pos + 1)
+        if new_pos is None:
+            new_pos = len(self._buf)
+        self.bytes_dropped += new_pos - self._pos
+        self._pos = new_pos
+
+    def _next_start(self, begin):
+        buf = self._buf
+        positions = [
+            p
+            for p in (
+                buf.find(FRAME_START_SHORT, begin),
+                buf.find(FRAME_START_LONG, begin),
+            )
+            if p >= 0
+        ]
+        return min(positions) if positions else None
+
+    def _frame_at(self, pos):
+        """Checks the frame starting at pos. Returns (payload, frame length)
+        for a complete valid frame, (None, 0) if more data is needed and
+        (None, -1) if no frame can start at pos."""
+        buf = self._buf
+        available = len(buf) - pos
+        start = buf[pos]
+        if start == FRAME_START_SHORT:
+            header_len = 2
+        elif start == FRAME_START_LONG:
+            header_len = 3
+        else:
+            return None, -1
+        if available < header_len:
+            return None, 0
+        if header_len == 2:
+            payload_len = buf[pos + 1]
+        else:
+            payload_len = (buf[pos + 1] << 8) | buf[pos + 2]
+        frame_len = header_len + payload_len + 3  # crc(2) + stop(1)
+        if (
+            payload_len == 0
+            or payload_len > MAX_PAYLOAD_LEN
+            or frame_len > self.max_size
+        ):
+            return None, -1
+        if available < frame_len:
+            return None, 0
+        if buf[pos + frame_len - 1] != FRAME_STOP:
+            return None, -1
+        with memoryview(buf) as view:
+            data = bytes(view[pos : pos + frame_len])
+        try:
+            payload, consumed = unframe(data)
+        except Exception:
+            payload, consumed = None, 0
+        if not payload or consumed != frame_len:
+            return None, -1  # CRC 실패 등
+        return bytes(payload), frame_len
+
+    def _next_valid_frame(self, begin):
+        """Position of the first start byte at or after begin that starts a
+        complete, valid frame, or None."""
+        p = self._next_start(begin)
+        while p is not None:
+            if self._frame_at(p)[0]:
+                return p
+            p = self._next_start(p + 1)
+        return None
+
+    def _next_payload(self):
+        """Returns the next payload, or None if more data is needed."""
+        try:
+            while len(self):
+                payload, frame_len = self._frame_at(self._pos)
+                if payload:
+                    self._pos += frame_len
+                    self.frames_decoded += 1
+                    return payload
+                if frame_len < 0:
+                    self._resync()
+                    continue
+                # 미완성 후보: 손상된 프레임의 stop 바이트(0x03) + 다음 프레임 헤더가
+                # 긴 프레임 헤더로 읽히면 수백 바이트를 기다리며 멈추므로, 뒤에 완전한
+                # 유효 프레임이 이미 있으면 후보를 버리고 거기서 재동기화
+                valid = self._next_valid_frame(self._pos + 1)
+                if valid is None:
+                    return None  # 프레임 미완성 -> 다음 read에서 이어서 처리
+                self.bytes_dropped += valid - self._pos
+                self._pos = valid
+            return None
+        finally:
+            if not len(self):
+                self.reset()  # 모두 소비됨 -> 버퍼 재사용
+
+    def payloads(self):
+        """Yields the payload of every complete frame in the buffer."""
+        while True:
+            payload = self._next_payload()
+            if payload is None:
+                return
+            yield payload
+
+    def messages(self):
+        """Yields (payload, message) for every complete frame.
+
+        message is None when pyvesc does not know the packet ID.
+        """
+        for payload in self.payloads():
+            try:
+                msg = VESCMessage.unpack(payload)
+            except Exception:
+                msg = None
+            yield payload, msg
+
+
+def set_read_timeout(ser, timeout):
+    """Sets ser.timeout only when it changes (pyserial reconfigures the port)."""
+    if ser.timeout != timeout:
+        ser.timeout = timeout
+
+
+def read_available(ser, timeout, wake=None):
+    """Returns the bytes already received, or waits for at most timeout
+    until the first byte arrives (or until the wake Event is set).
+
+    The port keeps the fixed READ_POLL_TIMEOUT and the wait loops on the
+    deadline instead: each ser.timeout assignment reconfigures the port
+    (tcsetattr / SetCommTimeouts), too costly to do on every read.
+    """
+    deadline = time.monotonic() + timeout
+    set_read_timeout(ser, READ_POLL_TIMEOUT)  # 연결 후 첫 호출에서만 실제로 설정됨
+    while True:
+        n = ser.in_waiting
+        if n:
+            return ser.read(n)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or (wake is not None and wake.is_set()):
+            return b""
+        if remaining < READ_POLL_TIMEOUT:
+            time.sleep(remaining)  # deadline 을 넘겨 블록하지 않도록
+            continue
+        data = ser.read(1)
+        if data:
+            n = ser.in_waiting
+            return data + ser.read(n) if n else data
+
+
+def read_into_decoder(ser, decoder, timeout=REALTIME_READ_TIMEOUT, wake=None):
+    """Reads whatever is available into decoder, blocking for at most timeout
+    until at least one complete frame is buffered. Returns the decoded
+    (payload, message) pairs; returns early when the wake Event is set."""
+    deadline = time.monotonic() + timeout
+    frames = []
+    while True:
+        chunk = read_available(ser, deadline - time.monotonic(), wake)
+        if chunk:
+            decoder.feed(chunk)
+            frames.extend(decoder.messages())
+        if frames or time.monotonic() >= deadline:
+            return frames
+        if wake is not None and wake.is_set():
+            return frames
+
+
+# --- COMM_GET_VALUES_SELECTIVE ---
+COMM_GET_VALUES_SELECTIVE = 50
+USE_SELECTIVE_VALUES = True  # GUI가 쓰는 필드만 요청 (False = 항상 전체 GetValues)
+SELECTIVE_FALLBACK_TIMEOUT = 1.0  # 이 시간 동안 응답이 없으면 전체 GetValues로 전환
+# 펌웨어(commands.c)의 mask 비트 순서: (속성 이름들, struct 포맷, 스케일)
+SELECTIVE_VALUE_FIELDS = (
+    (("temp_fet",), ">h", 1e1),  # bit 0
+    (("temp_motor",), ">h", 1e1),
+    (("avg_motor_current",), ">i", 1e2),
+    (("avg_input_current",), ">i", 1e2),
+    (("avg_id",), ">i", 1e2),
+    (("avg_iq",), ">i", 1e2),
+    (("duty_cycle_now",), ">h", 1e3),
+    (("rpm",), ">i", 1e0),
+    (("v_in",), ">h", 1e1),
+    (("amp_hours",), ">i", 1e4),
+    (("amp_hours_charged",), ">i", 1e4),
+    (("watt_hours",), ">i", 1e4),
+    (("watt_hours_charged",), ">i", 1e4),
+    (("tachometer",), ">i", None),
+    (("tachometer_abs",), ">i", None),
+    (("mc_fault_code",), ">B", None),  # bit 15
+    (("pid_pos_now",), ">i", 1e6),
+    (("app_controller_id",), ">B", None),
+    (("temp_mos1", "temp_mos2", "temp_mos3"), ">hhh", 1e1),
+    (("vd",), ">i", 1e3),
+    (("vq",), ">i", 1e3),
+    (("status",), ">B", None),  # bit 21
+)
+
+
+class SelectiveValues:
+    """GetValues-like sample holding only the fields requested by the mask."""
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __repr__(self):
+        fields = {k: v for k, v in vars(self).items() if k != "mask"}
+        return f"SelectiveValues({fields})"
+
+
+def selective_values_mask(field_names):
+    """Builds the GET_VALUES_SELECTIVE bit mask for the given attribute names."""
+    wanted = set(field_names)
+    mask = 0
+    for bit, (names, _, _) in enumerate(SELECTIVE_VALUE_FIELDS):
+        if wanted.intersection(names):
+            mask |= 1 << bit
+    return mask
+
+
+def encode_selective_request(mask):
+    return frame(struct.pack(">BI", COMM_GET_VALUES_SELECTIVE, mask))
+
+
+def parse_selective_values(payload):
+    """Parses a COMM_GET_VALUES_SELECTIVE response payload (ID byte included)."""
+    if len(payload) < 5 or payload[0] != COMM_GET_VALUES_SELECTIVE:
+        return None
+    (mask,) = struct.unpack_from(">I", payload, 1)
+    values = SelectiveValues(mask)
+    offset = 5
+    try:
+        for bit, (names, fmt, scale) in enumerate(SELECTIVE_VALUE_FIELDS):
+            if not mask & (1 << bit):
+                continue
+            raw = struct.unpack_from(fmt, payload, offset)
+            offset += struct.calcsize(fmt)
+            for name, v in zip(names, raw):
+                setattr(values, name, v / scale if scale else v)
+    except struct.error:
+        return None  # 페이로드가 mask보다 짧음
+    return values
+
+
+# --- COMM_FORWARD_CAN: CAN 버스 뒤의 VESC로 요청 전달 ---
+COMM_FORWARD_CAN = 34
+
+
+def encode_forward_can(can_id, payload):
+    """Wraps a command payload (ID byte included) for the VESC with can_id.
+
+    The remote VESC answers through the local one, unwrapped.
+    """
+    return frame(bytes([COMM_FORWARD_CAN, can_id]) + bytes(payload))
+
+
+def encode_realtime_request(mask=None, can_id=None):
+    """Encodes one telemetry request, forwarded over CAN if can_id is set."""
+    if can_id is None:
+        return (
+            encode_request(GetValues)
+            if mask is None
+            else encode_selective_request(mask)
+        )
+    if mask is None:
+        payload = packet_payload(encode_request(GetValues))
+    else:
+        payload = struct.pack(">BI", COMM_GET_VALUES_SELECTIVE, mask)
+    return encode_forward_can(can_id, payload)
+
+
+def sample_controller_id(values):
+    """Controller (CAN) ID reported in a telemetry sample, or None."""
+    cid = getattr(values, "app_controller_id", None)
+    if isinstance(cid, (bytes, bytearray)):
+        cid = cid[0] if cid else None
+    return cid
+
+
+def telemetry_sample(payload, msg):
+    """Returns the GetValues/SelectiveValues in a decoded frame, or None if
+    the frame is not telemetry."""
+    if isinstance(msg, GetValues):
+        return msg
+    if payload[0] == COMM_GET_VALUES_SELECTIVE:
+        return parse_selective_values(payload)
+    return None
 
 
 # --- get_realtime_data: SerialException 다시 발생시키도록 유지 ---
-def get_realtime_data(ser):
+def get_realtime_data(ser, decoder=None, timeout=REALTIME_READ_TIMEOUT):
+    """Requests GetValues and returns the reply, or None on timeout.
+
+    The reply is framed with a FrameDecoder, so a reply split across reads
+    or following stale bytes is still found. Pass the same decoder on every
+    call to keep a partial frame for the next call.
+    """
     if ser is None or not ser.is_open:
         return None
+    decoder = decoder or FrameDecoder()
     try:
-        request = encode_request(GetValues)
-        ser.write(request)
-        buffer = ser.read(128)  # Read based on ser.timeout
-        if buffer:
-            try:
-                (response_object, consumed) = decode(buffer)
-                if consumed > 0 and isinstance(response_object, GetValues):
-                    return response_object
-            except Exception:
-                pass  # Ignore decode errors silently
+        ser.write(encode_request(GetValues))
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            remaining = deadline - time.monotonic()
+            for _, msg in read_into_decoder(ser, decoder, remaining):
+                if isinstance(msg, GetValues):
+                    return msg
         return None
     except serial.SerialException as e:
         # DataReader가 SerialException을 잡고 처리하도록 다시 발생시킴
@@ -66,6 +420,12 @@ def send_command(ser, command):
         return False
 
 
+# --- 비상 정지: 미리 인코딩한 단일 burst ---
+def encode_stop_burst():
+    """SetCurrent(0), SetDutyCycle(0) and SetRPM(0) as one write."""
+    return b"".join(encode(c) for c in (SetCurrent(0), SetDutyCycle(0), SetRPM(0)))
+
+
 # --- close_serial_port: 변경 없음 ---
 def close_serial_port(ser):
     if ser and ser.is_open:
@@ -91,108 +451,107 @@ def clear_input_buffer(ser, wait_time=0.05):
             print(f"Error(read): Error clearing input buffer: {e}")
 
 
-# --- 설정 읽기 함수 로직 개선 ---
-def _read_config_response(ser, request_message_class, parser_func, timeout):
-    """설정 응답을 읽고 파싱하는 내부 헬퍼 함수 (루프 및 ID 확인 포함)."""
-    request = encode_request(request_message_class)
-    request_id = request_message_class.id
-    print(
-        f"Info(read): Requesting {request_message_class.__name__} (ID: {request_id})..."
-    )
-    clear_input_buffer(ser)  # 요청 전 버퍼 비우기
+def packet_id(packet):
+    """Returns the command ID of an encoded (framed) packet."""
+    header_len = 2 if packet[0] == FRAME_START_SHORT else 3
+    return packet[header_len]
+
+
+def packet_payload(packet):
+    """Returns the payload (command ID included) of an encoded packet."""
+    payload, _ = unframe(bytes(packet))
+    return payload
+
 
+# --- 설정 요청 인코딩/응답 파싱 (DataReader.submit 경로와 직접 읽기 공용) ---
+CONFIG_REQUESTS = {
+    "mcconf": (GetMcConfRequest, parse_mc_conf_serialized),
+    "appconf": (GetAppConfRequest, parse_app_conf_serialized),
+}
+
+
+def encode_config_request(kind):
+    """Returns (packet, reply ID) of a GET_MCCONF/GET_APPCONF request."""
+    request_cls = CONFIG_REQUESTS[kind][0]
+    return encode_request(request_cls), request_cls.id
+
+
+def parse_config_reply(kind, payload):
+    """Parses a GET_MCCONF/GET_APPCONF reply payload (ID byte included).
+
+    Returns (parsed dict, raw serialized payload), or (None, None).
+    """
+    if not payload:
+        return None, None
     try:
-        ser.write(request)
-        start_time = time.monotonic()
-        buffer = b""  # 수신 버퍼 초기화
-
-        while time.monotonic() - start_time < timeout:
-            # 새 데이터 읽기 (Non-blocking하게 또는 짧은 타임아웃으로)
-            bytes_to_read = ser.in_waiting
-            if bytes_to_read > 0:
-                buffer += ser.read(bytes_to_read)
-
-            # 버퍼에서 원하는 패킷 ID를 찾아 파싱 시도
-            while True:  # 버퍼 안에 여러 패킷이 있을 수 있음
-                try:
-                    # unframe은 첫 번째 유효 프레임을 찾거나 예외 발생
-                    payload, consumed = unframe(buffer)
-                    if payload:
-                        # print(f"Debug(read): Unframed packet. ID: {payload[0]}, Len: {len(payload)}, Consumed: {consumed}")
-                        if payload[0] == request_id:
-                            # 원하는 패킷 발견! 파싱 시도
-                            parsed_conf = parser_func(payload[1:])
-                            if parsed_conf and isinstance(parsed_conf, dict):
-                                # Signature 존재 여부는 파서가 결정하거나 여기서 추가 확인 가능
-                                print(
-                                    f"Info(read): {request_message_class.__name__} parsed successfully."
-                                )
-                                return parsed_conf
-                            else:
-                                print(
-                                    f"Error(read): {request_message_class.__name__} parsing failed after unframe."
-                                )
-                                buffer = buffer[
-                                    consumed:
-                                ]  # 파싱 실패해도 해당 부분은 버퍼에서 제거
-                                continue  # 다음 패킷 시도
-                        else:
-                            # ID가 다른 유효한 패킷 -> 무시하고 버퍼에서 제거
-                            # print(f"Debug(read): Ignoring packet with ID {payload[0]}.")
-                            buffer = buffer[consumed:]
-                            continue  # 다음 패킷 시도
-                    else:
-                        # 유효한 패킷 없음 (버퍼에 불완전한 데이터만 남음)
-                        break  # 내부 while 루프 탈출, 외부 while에서 더 읽기
-
-                except NeedMoreData:
-                    # 현재 버퍼로는 패킷 완성 불가 -> 더 읽어야 함
-                    # print("Debug(read): Need more data...")
-                    break  # 내부 while 루프 탈출, 외부 while에서 더 읽기
-                except ValueError:
-                    # CRC 실패 등 -> 해당 패킷은 손상됨, 버퍼 시작 부분 제거 시도?
-                    # print("Debug(read): ValueError during unframe (CRC? discard byte?)")
-                    if buffer:
-                        buffer = buffer[
-                            1:
-                        ]  # 손상 가능성 있는 첫 바이트 제거하고 다시 시도
-                    else:
-                        break  # 버퍼 비었으면 탈출
-                # except Exception as e_unframe:
-                # print(f"Debug(read): Unexpected unframe error: {e_unframe}")
-                # if buffer: buffer = buffer[1:] # 알수없는 오류시에도 첫 바이트 제거
-                # else: break
-
-            # 다음 읽기 시도 전 짧은 대기 (CPU 사용 방지)
-            time.sleep(0.02)
-
-        # Timeout 도달
-        print(
-            f"Error(read): Timeout waiting for {request_message_class.__name__} response."
-        )
-        print(f"Debug(read): Final buffer on timeout: {buffer!r}")
-        return None
+        parsed = CONFIG_REQUESTS[kind][1](payload[1:])
+    except Exception as e:
+        print(f"Error(read): {kind.upper()} parsing failed: {e}")
+        return None, None
+    if not isinstance(parsed, dict):
+        return None, None
+    return parsed, bytes(payload[1:])
+
 
+# --- 설정 읽기: 포트를 직접 사용 (DataReader 가 포트를 소유하지 않을 때) ---
+def _read_config_response(ser, kind, timeout):
+    """설정 요청을 보내고 같은 ID의 응답을 파싱하는 내부 헬퍼 함수."""
+    packet, reply_id = encode_config_request(kind)
+    print(f"Info(read): Requesting {kind.upper()} (ID: {reply_id})...")
+    clear_input_buffer(ser)  # 요청 전 버퍼 비우기
+    decoder = FrameDecoder()
+    try:
+        ser.write(packet)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            remaining = deadline - time.monotonic()
+            for payload, _ in read_into_decoder(ser, decoder, remaining):
+                if payload[0] != reply_id:
+                    continue  # ID가 다른 유효한 패킷 (예: 남아있던 GetValues 응답)
+                parsed, _ = parse_config_reply(kind, payload)
+                if parsed:
+                    print(f"Info(read): {kind.upper()} parsed successfully.")
+                    return parsed
+        print(f"Error(read): Timeout waiting for {kind.upper()} response.")
+        return None
     except serial.SerialException as e:
-        print(f"Serial Error during {request_message_class.__name__} read/write: {e}")
+        print(f"Serial Error during {kind.upper()} read/write: {e}")
         raise e  # Worker 스레드가 잡도록 예외 발생
     except Exception as e:
-        print(f"Error processing {request_message_class.__name__}: {e}")
+        print(f"Error processing {kind.upper()}: {e}")
         traceback.print_exc()
         return None
 
 
 def get_mc_configuration(ser):
     """VESC에서 MCCONF를 읽어옵니다 (내부 헬퍼 함수 사용)."""
-    # Signature 확인은 파서가 하거나 여기서 추가 가능 (예: 'MCCONF_SIGNATURE' in result)
-    return _read_config_response(
-        ser, GetMcConfRequest, parse_mc_conf_serialized, CONFIG_READ_TIMEOUT
-    )
+    return _read_config_response(ser, "mcconf", CONFIG_READ_TIMEOUT)
 
 
 def get_app_configuration(ser):
     """VESC에서 APPCONF를 읽어옵니다 (내부 헬퍼 함수 사용)."""
-    # Signature 확인은 파서가 하거나 여기서 추가 가능 (예: 'APPCONF_SIGNATURE' in result)
-    return _read_config_response(
-        ser, GetAppConfRequest, parse_app_conf_serialized, CONFIG_READ_TIMEOUT
-    )
+    return _read_config_response(ser, "appconf", CONFIG_READ_TIMEOUT)
+
+
+# --- COMM_FW_VERSION: 장치 식별 (설정 캐시 키) ---
+COMM_FW_VERSION = 0
+FW_INFO_TIMEOUT = 0.5  # seconds
+
+
+def parse_fw_version(payload):
+    """Parses a COMM_FW_VERSION reply: major, minor, hw name and MCU UUID."""
+    if len(payload) < 3 or payload[0] != COMM_FW_VERSION:
+        return None
+    info = {"fw_major": payload[1], "fw_minor": payload[2], "hw_name": "", "uuid": ""}
+    end = payload.find(b"\x00", 3)
+    if end < 0:
+        return info  # 아주 오래된 펌웨어: 버전만 보냄
+    info["hw_name"] = payload[3:end].decode("ascii", "replace")
+    uuid = payload[end + 1 : end + 13]
+    if len(uuid) == 12:
+        info["uuid"] = uuid.hex()
+    return info
+
+
+def encode_fw_version_request():
+    return frame(bytes([COMM_FW_VERSION]))
@@ -0,0 +1,277 @@
+import os
+import json
+import time
+import queue
+import threading
+
+import numpy as np
+
+import read
+import session
+
+# --- 장시간 텔레메트리 기록: memory-mapped columnar 파일 ---
+# 세션 디렉터리 하나에 column 마다 raw little-endian 배열 파일(<name>.bin) +
+# meta.json (column 목록, 기록된 행 수, 포트 목록 등).
+# 파일은 CHUNK_ROWS 단위로 미리 할당하고 현재 chunk 만 mmap 하므로
+# 기록 시간이 길어져도 프로세스 메모리(RSS)는 일정하게 유지됨.
+RECORD_DIR = os.path.join(os.path.expanduser("~"), ".rotom_control", "recordings")
+RECORD_VERSION = 1
+CHUNK_ROWS = 65536  # column 당 한 번에 할당/매핑하는 행 수
+QUEUE_LIMIT = 100000  # reader -> recorder 대기열 상한 (초과 시 샘플 drop)
+FLUSH_INTERVAL = 1.0  # mmap flush + meta.json 갱신 주기 (seconds)
+BATCH_LIMIT = 4096  # 한 번에 꺼내 쓰는 최대 샘플 수
+
+# device column: -1 = 직접 연결된 장치, 0..255 = CAN ID,
+# PORT_DEVICE_BASE + i = meta["ports"][i] 포트의 장치
+DEVICE_LOCAL = -1
+PORT_DEVICE_BASE = 1000
+
+# GetValues 의 모든 필드 (COMM_GET_VALUES 순서), 없는 필드는 NaN
+VALUE_FIELDS = tuple(
+    name for names, _, _ in read.SELECTIVE_VALUE_FIELDS for name in names
+)
+COLUMNS = (("timestamp", "<f8"), ("device", "<i2")) + tuple(
+    (name, "<f8") for name in VALUE_FIELDS
+)
+
+
+def default_recording_path(compressed=False):
+    name = time.strftime("telemetry_%Y%m%d_%H%M%S", time.localtime())
+    return os.path.join(RECORD_DIR, name + (".rses" if compressed else ""))
+
+
+def _preallocate(f, size):
+    """Grows a file to size bytes, reserving disk blocks where supported."""
+    fallocate = getattr(os, "posix_fallocate", None)
+    if fallocate:
+        try:
+            fallocate(f.fileno(), 0, size)
+            return
+        except OSError:
+            pass  # 파일 시스템이 지원하지 않으면 sparse 파일로 대체
+    f.truncate(size)
+
+
+class ColumnStore:
+    """Append-only columnar arrays backed by chunk-wise memory-mapped files."""
+
+    def __init__(self, directory, columns=COLUMNS, chunk_rows=CHUNK_ROWS, meta=None):
+        self.directory = directory
+        self.columns = [(name, np.dtype(dtype)) for name, dtype in columns]
+        self.chunk_rows = chunk_rows
+        self.meta = dict(meta or {})
+        self.count = 0
+        os.makedirs(directory, exist_ok=True)
+        self._files = {
+            name: open(os.path.join(directory, f"{name}.bin"), "w+b")
+            for name, _ in self.columns
+        }
+        self._maps = {}
+        self._chunk_start = None
+        self._map_chunk(0)
+        self.write_meta()
+
+    def _map_chunk(self, start):
+        """Unmaps the current chunk and maps rows [start, start+chunk_rows)."""
+        self._unmap()
+        end = start + self.chunk_rows
+        for name, dtype in self.columns:
+            f = self._files[name]
+            _preallocate(f, end * dtype.itemsize)
+            self._maps[name] = np.memmap(
+                f,
+                dtype=dtype,
+                mode="r+",
+                offset=start * dtype.itemsize,
+                shape=(self.chunk_rows,),
+            )
+        self._chunk_start = start
+
+    def _unmap(self):
+        for m in self._maps.values():
+            m.flush()
+        self._maps = {}  # 매핑 해제: 기록이 끝난 chunk 는 메모리에 남지 않음
+
+    def append(self, data, rows):
+        """Appends rows from data (column name -> array-like of length rows)."""
+        done = 0
+        while done < rows:
+            pos = self.count - self._chunk_start
+            if pos >= self.chunk_rows:
+                self._map_chunk(self.count)
+                pos = 0
+            n = min(rows - done, self.chunk_rows - pos)
+            for name, _ in self.columns:
+                self._maps[name][pos : pos + n] = data[name][done : done + n]
+            self.count += n
+            done += n
+
+    def write_meta(self, closed=False):
+        meta = dict(self.meta)
+        meta.update(
+            version=RECORD_VERSION,
+            columns=[[name, dtype.str] for name, dtype in self.columns],
+            count=self.count,
+            chunk_rows=self.chunk_rows,
+            closed=closed,
+        )
+        path = os.path.join(self.directory, "meta.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp, path)  # 중간에 죽어도 마지막 meta 는 유지
+
+    def flush(self):
+        for m in self._maps.values():
+            m.flush()
+        self.write_meta()
+
+    def close(self):
+        self._unmap()
+        # 미리 할당한 나머지 영역 제거: 파일 크기 = 실제 행 수
+        for name, dtype in self.columns:
+            f = self._files[name]
+            f.truncate(self.count * dtype.itemsize)
+            f.close()
+        self.write_meta(closed=True)
+
+
+def load_recording(directory):
+    """Returns (meta, {column: read-only array}) for a recording directory.
+
+    Arrays are memory-mapped, so hours of data can be opened without
+    loading them; an unclosed recording is read up to its last flush.
+    """
+    with open(os.path.join(directory, "meta.json")) as f:
+        meta = json.load(f)
+    count = meta["count"]
+    columns = {}
+    for name, dtype in meta["columns"]:
+        path = os.path.join(directory, f"{name}.bin")
+        if count == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+            continue
+        columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+    return meta, columns
+
+
+class TelemetryRecorder(threading.Thread):
+    """Background thread appending every published sample to a ColumnStore
+    (or, with compressed=True, a compressed session.SessionWriter file).
+
+    record() is called from the DataReader threads and never blocks: if
+    the disk falls behind by QUEUE_LIMIT samples, new samples are dropped
+    and counted instead.
+    """
+
+    def __init__(self, path=None, chunk_rows=None, compressed=False):
+        threading.Thread.__init__(self, daemon=True)
+        self.path = path or default_recording_path(compressed)
+        meta = {"start_wall": time.time()}
+        if compressed:
+            self.store = session.SessionWriter(
+                self.path, COLUMNS, chunk_rows or session.CHUNK_ROWS, meta=meta
+            )
+        else:
+            self.store = ColumnStore(
+                self.path, chunk_rows=chunk_rows or CHUNK_ROWS, meta=meta
+            )
+        self._queue = queue.Queue(maxsize=QUEUE_LIMIT)
+        self._ports = {}  # 포트 이름 -> device 코드
+        self.running = True
+        self.dropped = 0
+
+    def record(self, values):
+        try:
+            self._queue.put_nowait(values)
+        except queue.Full:
+            self.dropped += 1
+
+    @property
+    def count(self):
+        return self.store.count
+
+    def run(self):
+        last_flush = time.monotonic()
+        try:
+            while self.running or not self._queue.empty():
+                batch = self._take_batch()
+                if batch:
+                    self._write(batch)
+                now = time.monotonic()
+                if now - last_flush >= FLUSH_INTERVAL:
+                    self._flush()
+                    last_flush = now
+        except Exception as e:
+            print(f"Error(recorder): {e}")
+            self.running = False
+        finally:
+            self._close()
+
+    def _take_batch(self):
+        try:
+            batch = [self._queue.get(timeout=FLUSH_INTERVAL / 4)]
+        except queue.Empty:
+            return []
+        while len(batch) < BATCH_LIMIT:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _device_code(self, device):
+        if device is None:
+            return DEVICE_LOCAL
+        if isinstance(device, int):
+            return device
+        if device not in self._ports:
+            self._ports[device] = PORT_DEVICE_BASE + len(self._ports)
+            self.store.meta["ports"] = list(self._ports)
+        return self._ports[device]
+
+    def _write(self, batch):
+        rows = len(batch)
+        data = {
+            "timestamp": np.fromiter(
+                (getattr(v, "timestamp", np.nan) for v in batch), "<f8", rows
+            ),
+            "device": np.fromiter(
+                (self._device_code(getattr(v, "device", None)) for v in batch),
+                "<i2",
+                rows,
+            ),
+        }
+        for name in VALUE_FIELDS:
+            data[name] = np.fromiter(
+                (_as_float(getattr(v, name, None)) for v in batch), "<f8", rows
+            )
+        self.store.append(data, rows)
+
+    def _flush(self):
+        self.store.meta["dropped"] = self.dropped
+        self.store.flush()
+
+    def _close(self):
+        self.store.meta["dropped"] = self.dropped
+        self.store.close()
+        print(
+            f"Info(recorder): {self.store.count} samples "
+            f"({self.dropped} dropped) -> {self.path}"
+        )
+
+    def stop(self, timeout=2.0):
+        """Writes out queued samples and closes the recording."""
+        self.running = False
+        if self.is_alive():
+            self.join(timeout)
+
+
+def _as_float(v):
+    if isinstance(v, (bytes, bytearray)):
+        # mc_fault_code / app_controller_id 는 1바이트 bytes 로 디코딩됨
+        return float(v[0]) if v else np.nan
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
@@ -0,0 +1,266 @@
+import io
+import os
+import json
+import lzma
+import zlib
+import struct
+
+import numpy as np
+
+# --- 압축 chunk 세션 파일 (.rses) ---
+# 파일 형식 (big-endian 헤더, 데이터는 little-endian):
+#   header : MAGIC(8) + version(u16) + codec(u8) + chunk 행 수(u32) + column 수(u16)
+#            + column 정의 x N: 이름 길이(u8) + 이름 + dtype 길이(u8) + dtype ("<f8" 등)
+#   chunk  : 행 수(u32) + t_min(f64) + t_max(f64) + 본문 길이(u32)
+#            + column 마다: 압축 길이(u32) + 압축 데이터
+#   index  : (t_min(f64), t_max(f64), chunk offset(u64), 행 수(u32)) x N
+#   meta   : JSON (포트 목록 등)
+#   footer : index offset(u64) + chunk 수(u64) + meta offset(u64) + INDEX_MAGIC(8)
+# column 데이터는 값의 비트 패턴을 정수로 보고 delta 인코딩 -> byte shuffle -> 압축.
+# (float 도 비트 단위로 그대로 복원되는 무손실 방식)
+# footer 가 없으면 (기록 중 비정상 종료) chunk 헤더를 따라가며 index 를 재구성함.
+MAGIC = b"RTSES\x00\x00\x01"
+INDEX_MAGIC = b"RTSESIDX"
+VERSION = 1
+HEADER = struct.Struct(">8sHBIH")
+CHUNK = struct.Struct(">IddI")
+INDEX_ENTRY = struct.Struct(">ddQI")
+FOOTER = struct.Struct(">QQQ8s")
+CODECS = {"zlib": 1, "lzma": 2}
+CHUNK_ROWS = 4096  # chunk 하나의 행 수 (마지막 chunk 만 짧을 수 있음)
+TIME_COLUMN = "timestamp"
+
+
+def _compress(codec, data):
+    if codec == CODECS["lzma"]:
+        return lzma.compress(data, preset=6)
+    return zlib.compress(data, 6)
+
+
+def _decompress(codec, data):
+    if codec == CODECS["lzma"]:
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+def encode_column(values, codec):
+    """Delta-encodes the bit patterns of a column, byte-shuffles and compresses."""
+    values = np.ascontiguousarray(values)
+    bits = values.view(f"<u{values.dtype.itemsize}")
+    delta = np.empty_like(bits)
+    delta[:1] = bits[:1]
+    np.subtract(bits[1:], bits[:-1], out=delta[1:])  # 부호 없는 정수: wrap-around
+    # 같은 자리 바이트끼리 모아야 상위 바이트(대부분 0)가 잘 압축됨
+    shuffled = delta.view(np.uint8).reshape(-1, values.dtype.itemsize).T
+    return _compress(codec, shuffled.tobytes())
+
+
+def decode_column(data, dtype, rows, codec):
+    dtype = np.dtype(dtype)
+    raw = np.frombuffer(_decompress(codec, data), np.uint8)
+    delta = raw.reshape(dtype.itemsize, rows).T.copy().view(f"<u{dtype.itemsize}")
+    return np.cumsum(delta.ravel(), dtype=delta.dtype).view(dtype)
+
+
+class SessionWriter:
+    """Writes columnar samples as fixed-size compressed chunks.
+
+    Same append/flush/close interface as recorder.ColumnStore. Rows are
+    buffered until a chunk is full, so a crash loses at most one chunk.
+    """
+
+    def __init__(self, path, columns, chunk_rows=CHUNK_ROWS, codec="zlib", meta=None):
+        self.path = path
+        self.columns = [(name, np.dtype(dtype)) for name, dtype in columns]
+        self.chunk_rows = chunk_rows
+        self.codec = CODECS[codec]
+        self.meta = dict(meta or {})
+        self.count = 0
+        self._index = []
+        self._buf = {name: np.empty(chunk_rows, dtype) for name, dtype in self.columns}
+        self._fill = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "wb")
+        self._file.write(
+            HEADER.pack(MAGIC, VERSION, self.codec, chunk_rows, len(self.columns))
+        )
+        for name, dtype in self.columns:
+            name_b, dtype_b = name.encode(), dtype.str.encode()
+            self._file.write(bytes([len(name_b)]) + name_b)
+            self._file.write(bytes([len(dtype_b)]) + dtype_b)
+
+    def append(self, data, rows):
+        """Appends rows from data (column name -> array-like of length rows)."""
+        done = 0
+        while done < rows:
+            n = min(rows - done, self.chunk_rows - self._fill)
+            for name, _ in self.columns:
+                self._buf[name][self._fill : self._fill + n] = data[name][
+                    done : done + n
+                ]
+            self._fill += n
+            self.count += n
+            done += n
+            if self._fill == self.chunk_rows:
+                self._write_chunk()
+
+    def _write_chunk(self):
+        rows = self._fill
+        if not rows:
+            return
+        body = io.BytesIO()
+        for name, _ in self.columns:
+            blob = encode_column(self._buf[name][:rows], self.codec)
+            body.write(struct.pack(">I", len(blob)))
+            body.write(blob)
+        t = self._buf.get(TIME_COLUMN)
+        t_min, t_max = (
+            (float(np.nanmin(t[:rows])), float(np.nanmax(t[:rows])))
+            if t is not None and not np.isnan(t[:rows]).all()
+            else (np.nan, np.nan)
+        )
+        offset = self._file.tell()
+        self._file.write(CHUNK.pack(rows, t_min, t_max, body.tell()))
+        self._file.write(body.getbuffer())
+        self._index.append((t_min, t_max, offset, rows))
+        self._fill = 0
+
+    def flush(self):
+        self._file.flush()  # 채우는 중인 chunk 는 가득 차거나 close 할 때 기록
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._write_chunk()
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        meta_offset = self._file.tell()
+        self._file.write(json.dumps(self.meta).encode())
+        self._file.write(
+            FOOTER.pack(index_offset, len(self._index), meta_offset, INDEX_MAGIC)
+        )
+        self._file.close()
+
+
+class SessionReader:
+    """Random access to a session file by time range, one chunk at a time."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._read_header()
+            self.index, self.meta = self._load_index()
+        except (struct.error, ValueError, UnicodeDecodeError) as e:
+            self._file.close()
+            raise ValueError(f"Not a session file: {path} ({e})")
+
+    def _read_header(self):
+        magic, version, self.codec, self.chunk_rows, ncols = HEADER.unpack(
+            self._file.read(HEADER.size)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("bad header")
+        self.columns = []
+        for _ in range(ncols):
+            name = self._file.read(self._file.read(1)[0]).decode()
+            dtype = self._file.read(self._file.read(1)[0]).decode()
+            self.columns.append((name, np.dtype(dtype)))
+        self._data_start = self._file.tell()
+
+    def _load_index(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size >= self._data_start + FOOTER.size:
+            self._file.seek(size - FOOTER.size)
+            index_offset, chunks, meta_offset, magic = FOOTER.unpack(
+                self._file.read(FOOTER.size)
+            )
+            if magic == INDEX_MAGIC:
+                self._file.seek(index_offset)
+                raw = self._file.read(chunks * INDEX_ENTRY.size)
+                index = list(INDEX_ENTRY.iter_unpack(raw))
+                meta = json.loads(self._file.read(size - FOOTER.size - meta_offset))
+                return index, meta
+        return self._scan_chunks(size), {}
+
+    def _scan_chunks(self, size):
+        """Rebuilds the index from chunk headers (file without a footer)."""
+        index = []
+        offset = self._data_start
+        while offset + CHUNK.size <= size:
+            self._file.seek(offset)
+            rows, t_min, t_max, length = CHUNK.unpack(self._file.read(CHUNK.size))
+            end = offset + CHUNK.size + length
+            if end > size:
+                break  # 비정상 종료로 잘린 마지막 chunk
+            index.append((t_min, t_max, offset, rows))
+            offset = end
+        return index
+
+    @property
+    def count(self):
+        return sum(entry[3] for entry in self.index)
+
+    def time_range(self):
+        """(first, last) timestamp in the file, or None if it has no samples."""
+        t = [(lo, hi) for lo, hi, _, _ in self.index if not np.isnan(lo)]
+        if not t:
+            return None
+        return min(lo for lo, _ in t), max(hi for _, hi in t)
+
+    def read_chunk(self, i, columns=None):
+        """Decodes chunk i. Returns {column: array}."""
+        _, _, offset, rows = self.index[i]
+        wanted = set(columns) if columns else None
+        self._file.seek(offset + CHUNK.size)
+        out = {}
+        for name, dtype in self.columns:
+            (length,) = struct.unpack(">I", self._file.read(4))
+            if wanted is not None and name not in wanted and name != TIME_COLUMN:
+                self._file.seek(length, os.SEEK_CUR)  # 필요 없는 column 은 건너뜀
+                continue
+            out[name] = decode_column(self._file.read(length), dtype, rows, self.codec)
+        return out
+
+    def read(self, t0=None, t1=None, columns=None):
+        """Samples with t0 <= timestamp <= t1 (None = open end).
+
+        Only chunks whose time range overlaps [t0, t1] are decompressed.
+        """
+        lo = -np.inf if t0 is None else t0
+        hi = np.inf if t1 is None else t1
+        parts = []
+        for i, (t_min, t_max, _, _) in enumerate(self.index):
+            if t_max < lo or t_min > hi:
+                continue  # NaN 범위 (timestamp 없는 chunk) 는 항상 포함
+            chunk = self.read_chunk(i, columns)
+            t = chunk.get(TIME_COLUMN)
+            if t is not None and (t0 is not None or t1 is not None):
+                keep = (t >= lo) & (t <= hi)
+                chunk = {k: v[keep] for k, v in chunk.items()}
+            parts.append(chunk)
+        names = [n for n, _ in self.columns if not columns or n in columns]
+        if TIME_COLUMN in dict(self.columns) and TIME_COLUMN not in names:
+            names.insert(0, TIME_COLUMN)
+        dtypes = dict(self.columns)
+        return {
+            n: (
+                np.concatenate([p[n] for p in parts])
+                if parts
+                else np.empty(0, dtypes[n])
+            )
+            for n in names
+        }
+
+    def close(self):
+        self._file.close()
+
+
+def load_session(path, t0=None, t1=None, columns=None):
+    """Returns (meta, {column: array}) for the samples in [t0, t1]."""
+    reader = SessionReader(path)
+    try:
+        return reader.meta, reader.read(t0, t1, columns)
+    finally:
+        reader.close()
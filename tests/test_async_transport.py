@@ -0,0 +1,61 @@
+import os
+import sys
+import asyncio
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip("serial")
+pytest.importorskip("pyvesc")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import async_transport  # noqa: E402
+
+
+class FakeReader:
+    """Resolves each submitted request from another thread, like DataReader."""
+
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.submitted = []
+
+    def submit(self, packet, reply_id, timeout):
+        fut = Future()
+        self.submitted.append((packet, reply_id, timeout))
+        if self.reply is not None:
+            threading.Timer(0.01, fut.set_result, (self.reply,)).start()
+        return fut
+
+
+def test_request_returns_reply_payload():
+    reader = FakeReader(reply=b"\x00ok")
+    link = async_transport.AsyncLink(reader)
+    assert asyncio.run(link.request(b"pkt", 0, 1.0)) == b"\x00ok"
+    assert reader.submitted == [(b"pkt", 0, 1.0)]
+
+
+def test_request_gives_up_when_reader_never_answers(monkeypatch):
+    monkeypatch.setattr(async_transport, "REPLY_GRACE", 0.01)
+    link = async_transport.AsyncLink(FakeReader())
+    assert asyncio.run(link.request(b"pkt", 0, 0.01)) is None
+
+
+def test_bridge_hands_result_to_after():
+    calls = []
+    done = threading.Event()
+
+    class Widget:
+        def after(self, ms, fn, *args):
+            calls.append((ms, fn, args))
+            done.set()
+
+    async def work():
+        return 42
+
+    bridge = async_transport.TkBridge(Widget())
+    callback = calls.append
+    bridge.run(work(), callback)
+    assert done.wait(1)
+    bridge.close()
+    assert calls == [(0, callback, (42,))]
@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import capture  # noqa: E402
+
+
+class FakePort:
+    def read(self, size=1):
+        return b"\x02\x01\x04\x40\x84\x03"[:size]
+
+    def write(self, data):
+        return len(data)
+
+    def close(self):
+        pass
+
+
+def write_capture(path, records):
+    cap = capture.CaptureSerial(FakePort(), path)
+    for _ in range(records):
+        cap.read(6)
+    cap.close()
+
+
+def test_duration_is_last_record_not_last_index_entry(tmp_path):
+    path = str(tmp_path / "a.rcap")
+    # 마지막 index 항목(record 256) 뒤에 record 가 더 있음
+    write_capture(path, capture.INDEX_INTERVAL + 40)
+    reader = capture.CaptureReader(path)
+    last = None
+    while (rec := reader.next_record()) is not None:
+        last = rec[1]
+    assert reader.index[-1][0] < last
+    assert reader.duration() == last / 1e9
+
+
+def test_duration_without_footer(tmp_path):
+    path = str(tmp_path / "a.rcap")
+    write_capture(path, 10)
+    full = capture.CaptureReader(path)
+    records = []
+    while (rec := full.next_record()) is not None:
+        records.append(rec)
+    cut = str(tmp_path / "cut.rcap")
+    with open(path, "rb") as f:
+        raw = f.read(full._end - 3)  # 비정상 종료: footer 없음, 마지막 record 잘림
+    with open(cut, "wb") as f:
+        f.write(raw)
+    reader = capture.CaptureReader(cut)
+    assert reader.duration() == records[-2][1] / 1e9
+    assert reader.next_record() == records[0]  # duration() 이 읽기 위치를 바꾸지 않음
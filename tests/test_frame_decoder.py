@@ -0,0 +1,58 @@
+import os
+import sys
+import struct
+
+import pytest
+
+pytest.importorskip("serial")
+pytest.importorskip("pyvesc")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import read  # noqa: E402
+
+
+def selective_frame(n):
+    """29-byte COMM_GET_VALUES_SELECTIVE frame (24-byte payload)."""
+    payload = bytes([read.COMM_GET_VALUES_SELECTIVE]) + struct.pack(">I", 0x1FF)
+    payload += struct.pack(">i", n) + bytes(range(15))
+    frame = read.frame(payload)
+    assert len(frame) == 29
+    return frame, payload
+
+
+def corrupt_crc(frame):
+    # CRC 첫 바이트 반전: stop 바이트(0x03)는 그대로 남음
+    frame = bytearray(frame)
+    frame[-3] ^= 0xFF
+    return bytes(frame)
+
+
+def test_corrupted_crc_does_not_stall_following_frames():
+    decoder = read.FrameDecoder()
+    bad, _ = selective_frame(0)
+    decoder.feed(corrupt_crc(bad))
+    assert list(decoder.payloads()) == []
+    # 손상된 프레임의 stop 바이트 + 다음 프레임의 "02 <len>" 이 ~536 바이트 길이의
+    # 긴 프레임 헤더로 읽혀도 각 정상 프레임은 도착하자마자 나와야 함
+    for n in range(1, 20):
+        frame, payload = selective_frame(n)
+        decoder.feed(frame)
+        assert list(decoder.payloads()) == [payload]
+    assert decoder.frames_decoded == 19
+
+
+def test_corrupted_crc_in_one_read():
+    decoder = read.FrameDecoder()
+    frames = [selective_frame(n) for n in range(4)]
+    decoder.feed(corrupt_crc(frames[0][0]) + b"".join(f for f, _ in frames[1:]))
+    assert list(decoder.payloads()) == [p for _, p in frames[1:]]
+
+
+def test_partial_frame_waits_for_rest():
+    decoder = read.FrameDecoder()
+    frame = read.frame(bytes([14]) + bytes(range(256)) * 3)  # 긴 프레임 (0x03 헤더)
+    decoder.feed(frame[:500])
+    assert list(decoder.payloads()) == []
+    decoder.feed(frame[500:])
+    assert [len(p) for p in decoder.payloads()] == [769]
+    assert decoder.bytes_dropped == 0
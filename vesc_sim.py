@@ -0,0 +1,411 @@
+import os
+import pty
+import tty
+import time
+import heapq
+import random
+import select
+import struct
+import argparse
+import threading
+
+# --- 사용자 정의 모듈 Import (프레임 디코더/인코더, 필드 정의 재사용) ---
+try:
+    import read
+    from read import frame
+    from pyvesc.VESC.messages.setters import SetMcConf, SetAppConf
+    from pyvesc.VESC.messages.vesc_protocol_utils import (
+        encode_set_mcconf,
+        encode_set_appconf,
+    )
+except ImportError as e:
+    print(f"오류(vesc_sim.py): read 모듈 import 실패 ({e}).")
+    raise
+
+# --- 가상 VESC (Linux pseudo-terminal) ---
+# 실제 프레임 형식으로 응답하므로 read.py / DataReader 를 하드웨어 없이 측정 가능.
+#   python vesc_sim.py --baud 115200 --latency 1.0 --jitter 0.5 --corrupt 0.001
+# 출력된 /dev/pts/N 경로를 GUI 포트로 사용하거나 serial.Serial 로 직접 연결.
+COMM_FW_VERSION = 0
+COMM_GET_VALUES = 4
+COMM_SET_DUTY = 5
+COMM_SET_CURRENT = 6
+COMM_SET_CURRENT_BRAKE = 7
+COMM_SET_RPM = 8
+COMM_SET_MCCONF = 13
+COMM_GET_MCCONF = 14
+COMM_GET_MCCONF_DEFAULT = 15
+COMM_SET_APPCONF = 16
+COMM_GET_APPCONF = 17
+COMM_GET_APPCONF_DEFAULT = 18
+COMM_ALIVE = 30
+COMM_FORWARD_CAN = 34
+COMM_GET_VALUES_SELECTIVE = 50
+
+FULL_VALUES_MASK = (1 << len(read.SELECTIVE_VALUE_FIELDS)) - 1
+# 기본 설정 직렬화: (메시지 클래스, 설정 속성 이름, 인코더)
+CONF_ENCODERS = {
+    "mcconf": (SetMcConf, "mc_configuration", encode_set_mcconf),
+    "appconf": (SetAppConf, "app_configuration", encode_set_appconf),
+}
+DEFAULT_CONF_SCRATCH = (
+    4096  # 필드 목록을 얻을 때 파서에 주는 0 버퍼 크기 (직렬화 크기 이상)
+)
+
+
+def default_conf(kind):
+    """Serialized default MCCONF/APPCONF built from pyvesc's field
+    definitions, so GET_MCCONF/GET_APPCONF replies parse like a device's.
+
+    Every field is zero. Pass a blob captured from a real controller
+    (--mcconf/--appconf) for realistic values.
+    """
+    msg_cls, attr, encode_set = CONF_ENCODERS[kind]
+    # 필드 정의는 pyvesc 파서/인코더에만 있음: 0 버퍼를 파싱해 필드 목록을 얻고
+    # GUI 가 쓰기에 사용하는 인코더로 다시 직렬화 (크기/순서가 정의와 일치)
+    fields, _ = read.parse_config_reply(kind, bytes(DEFAULT_CONF_SCRATCH + 1))
+    if fields:
+        msg = msg_cls()
+        setattr(msg, attr, fields)
+        raw = read.packet_payload(encode_set(msg))[1:]
+        parsed, _ = read.parse_config_reply(kind, b"\x00" + raw)
+        if parsed == fields:
+            return raw
+    raise ValueError(
+        f"Could not serialize a default {kind.upper()} with this pyvesc; "
+        f"pass a captured blob (--{kind})."
+    )
+
+
+class MotorModel:
+    """First-order BLDC model: electrical current from duty/back-EMF, rotor
+    speed from torque minus viscous friction. Advanced lazily on access."""
+
+    def __init__(self, v_in=24.0, erpm_per_volt=1000.0, resistance=0.1, rng=None):
+        self.rng = rng or random.Random()
+        self.v_in = v_in
+        self.erpm_per_volt = erpm_per_volt  # 무부하 ERPM/V (Kv x 극쌍 수)
+        self.resistance = resistance  # 상 저항 (ohm)
+        self.inertia = 2e-3  # ERPM/s per A 환산 관성
+        self.friction = 0.5  # 점성 마찰 (1/s)
+        self.current_limit = 60.0
+        self.timeout = 1.0  # 펌웨어 app timeout: 명령이 끊기면 출력 해제 (seconds)
+        self.mode = None  # "duty" | "current" | "brake" | "rpm" | None
+        self.setpoint = 0.0
+        self.erpm = 0.0
+        self.current = 0.0
+        self.duty = 0.0
+        self.temp_fet = 25.0
+        self.temp_motor = 25.0
+        self.amp_hours = 0.0
+        self.watt_hours = 0.0
+        self.tachometer = 0.0
+        self.timeouts = 0
+        self._last_command = time.monotonic()
+        self._t = time.monotonic()
+
+    def command(self, mode, setpoint):
+        self.advance()
+        self.mode, self.setpoint = mode, setpoint
+        self._last_command = time.monotonic()
+
+    def keepalive(self):
+        self._last_command = time.monotonic()
+
+    def advance(self):
+        now = time.monotonic()
+        dt, self._t = now - self._t, now
+        if self.mode and now - self._last_command > self.timeout:
+            self.mode = None  # 펌웨어 timeout 동작
+            self.timeouts += 1
+        steps = max(1, min(1000, int(dt / 1e-3) + 1))  # 약 1 ms 단위 적분
+        for _ in range(steps):
+            self._step(dt / steps)
+
+    def _step(self, dt):
+        back_emf = self.erpm / self.erpm_per_volt
+        if self.mode == "duty":
+            self.duty = self.setpoint
+            i = (self.duty * self.v_in - back_emf) / self.resistance
+        elif self.mode == "current":
+            i = self.setpoint
+        elif self.mode == "brake":
+            i = -abs(self.setpoint) if self.erpm > 0 else abs(self.setpoint)
+        elif self.mode == "rpm":
+            i = 0.01 * (self.setpoint - self.erpm)  # P 제어
+        else:
+            i = 0.0
+        self.current = max(-self.current_limit, min(self.current_limit, i))
+        if self.mode != "duty":
+            self.duty = max(-1.0, min(1.0, back_emf / self.v_in)) if self.mode else 0.0
+        self.erpm += (self.current / self.inertia - self.friction * self.erpm) * dt
+        input_current = self.current * abs(self.duty)
+        self.amp_hours += abs(input_current) * dt / 3600.0
+        self.watt_hours += abs(input_current * self.v_in) * dt / 3600.0
+        self.tachometer += self.erpm / 60.0 * 6 * dt
+        heat = self.current**2 * self.resistance
+        self.temp_fet += (0.002 * heat - 0.05 * (self.temp_fet - 25.0)) * dt
+        self.temp_motor += (0.004 * heat - 0.02 * (self.temp_motor - 25.0)) * dt
+
+    def values(self, controller_id=0):
+        """Field values in SELECTIVE_VALUE_FIELDS order (unscaled)."""
+        self.advance()
+        noise = self.rng.gauss
+        i_in = self.current * abs(self.duty)
+        return {
+            "temp_fet": self.temp_fet,
+            "temp_motor": self.temp_motor,
+            "avg_motor_current": self.current + noise(0, 0.05),
+            "avg_input_current": i_in + noise(0, 0.02),
+            "avg_id": 0.0,
+            "avg_iq": self.current,
+            "duty_cycle_now": self.duty,
+            "rpm": self.erpm,
+            "v_in": self.v_in - 0.02 * i_in,
+            "amp_hours": self.amp_hours,
+            "amp_hours_charged": 0.0,
+            "watt_hours": self.watt_hours,
+            "watt_hours_charged": 0.0,
+            "tachometer": self.tachometer,
+            "tachometer_abs": abs(self.tachometer),
+            "mc_fault_code": 0,
+            "pid_pos_now": 0.0,
+            "app_controller_id": controller_id,
+            "temp_mos1": self.temp_fet,
+            "temp_mos2": self.temp_fet,
+            "temp_mos3": self.temp_fet,
+            "vd": 0.0,
+            "vq": self.duty * self.v_in,
+            "status": 0,
+        }
+
+
+def pack_values(values, mask=FULL_VALUES_MASK):
+    """Packs field values in firmware order, keeping only the bits in mask."""
+    out = bytearray()
+    for bit, (names, fmt, scale) in enumerate(read.SELECTIVE_VALUE_FIELDS):
+        if not mask & (1 << bit):
+            continue
+        raw = [values[n] * scale if scale else values[n] for n in names]
+        out += struct.pack(fmt, *(int(round(v)) for v in raw))
+    return bytes(out)
+
+
+class VescSimulator:
+    """Simulated VESC behind a pseudo-terminal.
+
+    baudrate paces replies as a UART of that speed would (None = as fast as
+    the pty allows). Each reply is delayed by latency plus uniform jitter
+    (seconds), and corrupt_rate is the chance of flipping one byte of a
+    reply frame. can_ids adds simulated controllers reachable through
+    COMM_FORWARD_CAN.
+    """
+
+    def __init__(
+        self,
+        baudrate=None,
+        latency=0.0,
+        jitter=0.0,
+        corrupt_rate=0.0,
+        seed=None,
+        mcconf=None,
+        appconf=None,
+        can_ids=(),
+        controller_id=0,
+    ):
+        self.baudrate = baudrate
+        self.latency = latency
+        self.jitter = jitter
+        self.corrupt_rate = corrupt_rate
+        self.rng = random.Random(seed)
+        self.controller_id = controller_id
+        self.motors = {controller_id: MotorModel(rng=self.rng)}
+        for can_id in can_ids:
+            self.motors[can_id] = MotorModel(rng=self.rng)
+        # 설정은 직렬화된 blob 그대로 보관 (SET 으로 받은 내용을 GET 으로 돌려줌)
+        self.confs = {
+            "mcconf": mcconf or default_conf("mcconf"),
+            "appconf": appconf or default_conf("appconf"),
+        }
+        self.config_write_delay = 0.05  # 플래시 저장 시간 (seconds)
+        self.stats = {"rx_frames": 0, "tx_frames": 0, "corrupted": 0, "unknown": 0}
+        self.master = self.slave = None
+        self.port = None
+        self.running = False
+        self._tx = []  # heap: (ready time, seq, bytes)
+        self._tx_seq = 0
+        self._tx_cond = threading.Condition()
+        self._last_ready = 0.0
+        self._threads = []
+
+    # --- 시작/종료 ---
+    def start(self):
+        """Opens the pty and starts serving. Returns the port path."""
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)  # 줄 단위 처리/echo 없이 바이트 그대로 전달
+        self.port = os.ttyname(self.slave)
+        self.running = True
+        for target in (self._rx_loop, self._tx_loop):
+            t = threading.Thread(target=target, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self.port
+
+    def stop(self):
+        self.running = False
+        with self._tx_cond:
+            self._tx_cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=1.0)
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    # --- 수신: 요청 프레임 디코딩 및 응답 생성 ---
+    def _rx_loop(self):
+        decoder = read.FrameDecoder()
+        while self.running:
+            ready, _, _ = select.select([self.master], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                break  # 상대편이 닫힘
+            decoder.feed(data)
+            for payload in decoder.payloads():
+                self.stats["rx_frames"] += 1
+                try:
+                    self._handle(bytes(payload), self.controller_id)
+                except struct.error:
+                    self.stats["unknown"] += 1  # 길이가 맞지 않는 요청
+
+    def _handle(self, payload, controller_id):
+        cmd = payload[0]
+        motor = self.motors[controller_id]
+        if cmd == COMM_GET_VALUES:
+            self._reply(bytes([cmd]) + pack_values(motor.values(controller_id)))
+        elif cmd == COMM_GET_VALUES_SELECTIVE and len(payload) >= 5:
+            (mask,) = struct.unpack_from(">I", payload, 1)
+            body = pack_values(motor.values(controller_id), mask)
+            self._reply(payload[:5] + body)
+        elif cmd in (COMM_SET_DUTY, COMM_SET_CURRENT, COMM_SET_CURRENT_BRAKE):
+            (raw,) = struct.unpack_from(">i", payload, 1)
+            mode, scale = {
+                COMM_SET_DUTY: ("duty", 1e5),
+                COMM_SET_CURRENT: ("current", 1e3),
+                COMM_SET_CURRENT_BRAKE: ("brake", 1e3),
+            }[cmd]
+            motor.command(mode, raw / scale)
+        elif cmd == COMM_SET_RPM:
+            (rpm,) = struct.unpack_from(">i", payload, 1)
+            motor.command("rpm", float(rpm))
+        elif cmd == COMM_ALIVE:
+            motor.keepalive()
+        elif cmd in (COMM_GET_MCCONF, COMM_GET_MCCONF_DEFAULT):
+            self._reply(bytes([cmd]) + self.confs["mcconf"])
+        elif cmd in (COMM_GET_APPCONF, COMM_GET_APPCONF_DEFAULT):
+            self._reply(bytes([cmd]) + self.confs["appconf"])
+        elif cmd in (COMM_SET_MCCONF, COMM_SET_APPCONF):
+            kind = "mcconf" if cmd == COMM_SET_MCCONF else "appconf"
+            self.confs[kind] = payload[1:]
+            self._reply(bytes([cmd]), extra_delay=self.config_write_delay)
+        elif cmd == COMM_FW_VERSION:
+            uuid = struct.pack(">I", 0x51500000 + controller_id) + bytes(8)
+            self._reply(bytes([cmd, 6, 5]) + b"VESC_SIM\x00" + uuid + bytes(2))
+        elif cmd == COMM_FORWARD_CAN and len(payload) >= 3:
+            if payload[1] in self.motors:  # 없는 CAN ID 는 응답 없음 (실제와 동일)
+                self._handle(payload[2:], payload[1])
+        else:
+            self.stats["unknown"] += 1
+
+    # --- 송신: latency/jitter 후 baud 속도로 전송 ---
+    def _reply(self, payload, extra_delay=0.0):
+        packet = bytearray(frame(payload))
+        if self.corrupt_rate and self.rng.random() < self.corrupt_rate:
+            packet[self.rng.randrange(len(packet))] ^= 1 << self.rng.randrange(8)
+            self.stats["corrupted"] += 1
+        delay = self.latency + extra_delay + self.rng.uniform(0, self.jitter)
+        with self._tx_cond:
+            # 펌웨어는 요청을 순서대로 처리하므로 응답 순서는 유지
+            ready = max(time.monotonic() + delay, self._last_ready)
+            self._last_ready = ready
+            heapq.heappush(self._tx, (ready, self._tx_seq, bytes(packet)))
+            self._tx_seq += 1
+            self._tx_cond.notify()
+
+    def _tx_loop(self):
+        while self.running:
+            with self._tx_cond:
+                while self.running and not self._tx:
+                    self._tx_cond.wait(0.1)
+                if not self.running:
+                    return
+                ready, _, packet = self._tx[0]
+                wait = ready - time.monotonic()
+                if wait > 0:
+                    self._tx_cond.wait(wait)
+                    continue
+                heapq.heappop(self._tx)
+            self._write_paced(packet)
+            self.stats["tx_frames"] += 1
+
+    def _write_paced(self, packet):
+        if not self.baudrate:
+            os.write(self.master, packet)
+            return
+        byte_time = 10.0 / self.baudrate  # 8N1: 바이트당 10 bit
+        chunk = max(1, int(0.001 / byte_time))  # 약 1 ms 분량씩
+        start = time.monotonic()
+        for i in range(0, len(packet), chunk):
+            os.write(self.master, packet[i : i + chunk])
+            due = start + (i + chunk) * byte_time
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated VESC on a pty.")
+    parser.add_argument("--baud", type=int, default=115200, help="0 = unpaced")
+    parser.add_argument("--latency", type=float, default=1.0, help="ms per reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="ms, uniform")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="frame ratio")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--can-ids", default="", help="e.g. 1,2")
+    parser.add_argument("--mcconf", help="raw serialized MCCONF file")
+    parser.add_argument("--appconf", help="raw serialized APPCONF file")
+    args = parser.parse_args()
+
+    def load(path):
+        if not path:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    sim = VescSimulator(
+        baudrate=args.baud or None,
+        latency=args.latency / 1e3,
+        jitter=args.jitter / 1e3,
+        corrupt_rate=args.corrupt,
+        seed=args.seed,
+        mcconf=load(args.mcconf),
+        appconf=load(args.appconf),
+        can_ids=[int(c) for c in args.can_ids.split(",") if c.strip()],
+    )
+    print(f"Simulated VESC on {sim.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5.0)
+            print(f"Stats: {sim.stats}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()